@@ -2,17 +2,19 @@
 Unified FastAPI backend for all stages.
 Clean, modular implementation with separated concerns.
 """
-import sys
-from pathlib import Path
-from fastapi import FastAPI, HTTPException, Query
+import asyncio
+from contextlib import asynccontextmanager
+import anyio
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
 from common.config import config
 from common.logging_config import get_logger, setup_logging
-from backend.models import ChatRequest, ChatResponse
-from backend.workflow_loader import load_workflow, get_current_stage, get_workflow, workflows
-from backend.streaming import stream_agent_response
+from backend.models import ChatRequest
+from backend.workflow_loader import load_workflow, load_workflow_async, get_current_stage, get_workflow, normalize_stage, reset_workflows
 from backend.response_handler import extract_response
 from backend.session_manager import get_session_manager
 
@@ -20,11 +22,38 @@ from backend.session_manager import get_session_manager
 setup_logging(log_level=config.LOG_LEVEL)
 logger = get_logger(__name__)
 
+# Under `gunicorn --preload` this runs once in the master process, and workers
+# share the loaded workflow (embedding model included) copy-on-write
+if config.PRELOAD_WORKFLOW:
+    load_workflow(config.STAGE)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start loading the configured stage in the background so the API serves immediately."""
+    # Blocking workflow calls run in anyio's threadpool; size it for concurrent chats
+    anyio.to_thread.current_default_thread_limiter().total_tokens = config.BACKEND_WORKER_THREADS
+    
+    stage_num = config.STAGE
+    app.state.warmup_stage = normalize_stage(stage_num)
+    app.state.warmup = asyncio.create_task(_warm_up(stage_num))
+    app.state.session_sweeper = asyncio.create_task(get_session_manager().sweep_periodically())
+    logger.info(f"API ready - loading Stage {stage_num} in background")
+    
+    yield
+    
+    # Stop background tasks on shutdown
+    app.state.session_sweeper.cancel()
+    app.state.warmup.cancel()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Customer Support Agent API - Unified",
     description="Configurable backend supporting all stages with multiple patterns",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -34,19 +63,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses instead of re-sending OPTIONS per request
 )
 
+# Compress JSON responses (Starlette leaves text/event-stream uncompressed so frames flush promptly)
+app.add_middleware(GZipMiddleware, minimum_size=256)
+
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize with configured stage from environment."""
+async def _warm_up(stage_num):
+    """Load a workflow off the event loop; failures are retried by the first request."""
     try:
-        stage_num = config.STAGE
-        load_workflow(stage_num)
-        logger.info(f"API ready - loaded Stage {stage_num}")
+        # Don't take over as current stage if a request already switched stages meanwhile
+        await run_in_threadpool(load_workflow, stage_num, False)
+        logger.info(f"Stage {stage_num} workflow loaded")
     except Exception as e:
-        logger.error(f"API startup error: {str(e)}")
-        raise
+        logger.error(f"Background load of Stage {stage_num} failed: {str(e)}")
+
+
+def _warmup_done() -> bool:
+    """Check whether the startup workflow load has finished."""
+    warmup = getattr(app.state, "warmup", None)
+    return warmup is None or warmup.done()
+
+
+async def _wait_for_warmup(stage=None):
+    """
+    Wait for the startup workflow load if the request depends on it.
+    
+    Requests that resolve the configured/current stage (stage=None) or target the
+    stage being warmed up wait; other stages build independently under their own lock.
+    
+    Args:
+        stage: Explicit stage the request targets, or None to use the current stage
+    """
+    if _warmup_done():
+        return
+    if stage is not None and normalize_stage(stage) != app.state.warmup_stage:
+        return
+    # Shield the shared task so a cancelled request doesn't cancel the warm-up for everyone
+    await asyncio.shield(app.state.warmup)
 
 
 @app.get("/health")
@@ -57,15 +112,16 @@ async def health_check():
     
     health_info = {
         "status": "healthy",
+        "ready": _warmup_done() and workflow is not None,
         "stage": stage,
         "available_stages": [1, 2, 3.1, 3.2, 3.3, 4.11, 4.12],
         "workflow_initialized": workflow is not None,
         "default_model": f"{config.DEFAULT_MODEL_TYPE}:{config.DEFAULT_MODEL_NAME}",
-        "tools_count": _get_tools_count(workflow, stage)
+        "tools_count": workflow.capabilities.tools_count if workflow else 0
     }
     
     # Add struggle stats for Stage 2
-    if stage == 2 and workflow and hasattr(workflow, 'get_struggle_stats'):
+    if stage == 2 and workflow and workflow.capabilities.has_struggle_stats:
         health_info["struggle_stats"] = workflow.get_struggle_stats()
     
     return health_info
@@ -74,82 +130,28 @@ async def health_check():
 @app.post("/stage/{stage_num}")
 async def switch_stage(stage_num: str):
     """Switch to a different stage."""
+    await _wait_for_warmup(stage_num)
     try:
-        workflow = load_workflow(stage_num)
+        workflow = await load_workflow_async(stage_num)
         return {
             "message": f"Switched to Stage {stage_num}",
             "stage": stage_num,
-            "tools_count": _get_tools_count(workflow, stage_num),
+            "tools_count": workflow.capabilities.tools_count,
             "default_model": f"{config.DEFAULT_MODEL_TYPE}:{config.DEFAULT_MODEL_NAME}"
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-def _get_tools_count(workflow, stage):
-    """Get tools count based on workflow type."""
-    if not workflow:
-        return 0
-    
-    # Convert stage to string for comparison
-    stage_str = str(stage) if stage is not None else ""
-    
-    # Stage 4 supervisors have different structures
-    if stage_str in ["4.11", "4.1.1"]:
-        # Supervisor 1: has specialists dict
-        return len(workflow.specialists) if hasattr(workflow, 'specialists') else 0
-    elif stage_str in ["4.12", "4.1.2"]:
-        # Supervisor 2: has specialist_tools list  
-        return len(workflow.specialist_tools) if hasattr(workflow, 'specialist_tools') else 0
-    else:
-        # Regular agents have tools directly
-        return len(workflow.agent.tools) if hasattr(workflow, 'agent') and hasattr(workflow.agent, 'tools') else 0
-
-
 @app.get("/tools")
 async def list_tools(stage_param: str = Query(None, description="Stage to get tools for")):
     """List available tools for the specified stage."""
+    await _wait_for_warmup(stage_param)
     target_stage = stage_param or get_current_stage() or "1"
-    workflow = load_workflow(target_stage)
-    
-    tools_info = []
     
-    # Handle different workflow structures
-    if target_stage in ["4.1", "4.11", "4.1.1"]:
-        # Supervisor 1: Show specialist agents
-        if hasattr(workflow, 'specialists'):
-            for name, agent in workflow.specialists.items():
-                tools_info.append({
-                    "name": f"specialist_{name}",
-                    "description": f"Specialist agent for {name.replace('_', ' ')}"
-                })
-    elif target_stage in ["4.12", "4.1.2"]:
-        # Supervisor 2: Show wrapped specialist tools
-        if hasattr(workflow, 'specialist_tools'):
-            for tool in workflow.specialist_tools:
-                tools_info.append({
-                    "name": tool.name,
-                    "description": getattr(tool, 'description', 'No description available')
-                })
-    else:
-        # Regular workflows with agent.tools
-        if hasattr(workflow, 'agent') and hasattr(workflow.agent, 'tools'):
-            for tool in workflow.agent.tools:
-                if hasattr(tool, 'name'):
-                    tools_info.append({
-                        "name": tool.name,
-                        "description": getattr(tool, 'description', 'No description available')
-                    })
-                elif isinstance(tool, str):
-                    tools_info.append({
-                        "name": tool,
-                        "description": "No description available"
-                    })
-                else:
-                    tools_info.append({
-                        "name": str(tool),
-                        "description": "No description available"
-                    })
+    # Tool listings are described once when the workflow is loaded
+    workflow = await load_workflow_async(target_stage)
+    tools_info = workflow.capabilities.tools_info
     
     return {
         "tools": tools_info,
@@ -158,47 +160,51 @@ async def list_tools(stage_param: str = Query(None, description="Stage to get to
     }
 
 
+# Static stage catalogue served by /stages
+STAGES_INFO = {
+    1: {
+        "name": "Foundation - Simple ReAct Agent",
+        "tools_count": 2,
+        "description": "Basic ReAct agent with order lookup and FAQ search"
+    },
+    2: {
+        "name": "Sophisticated Single Agent",
+        "tools_count": 7,
+        "description": "Same ReAct agent with tool complexity that reveals limitations"
+    },
+    3.1: {
+        "name": "ReWOO - Reasoning Without Observation",
+        "tools_count": 7,
+        "description": "Plans all steps upfront, then executes - only 2 LLM calls vs N+1"
+    },
+    3.2: {
+        "name": "Reflection - Self-Critique Pattern",
+        "tools_count": 7,
+        "description": "Coming soon - Agent reflects on and improves its outputs"
+    },
+    3.3: {
+        "name": "Plan-and-Execute - Hierarchical Planning",
+        "tools_count": 7,
+        "description": "Coming soon - Separates planning from execution"
+    },
+    "4.11": {
+        "name": "Supervisor 1 - Built-in create_supervisor()",
+        "tools_count": 3,
+        "description": "Production-ready supervisor using LangGraph's built-in function"
+    },
+    "4.12": {
+        "name": "Supervisor 2 - Custom Implementation",
+        "tools_count": 3,
+        "description": "Educational supervisor showing full coordination mechanics"
+    }
+}
+
+
 @app.get("/stages")
 async def list_stages():
     """List all available stages and their info."""
     return {
-        "available_stages": {
-            1: {
-                "name": "Foundation - Simple ReAct Agent",
-                "tools_count": 2,
-                "description": "Basic ReAct agent with order lookup and FAQ search"
-            },
-            2: {
-                "name": "Sophisticated Single Agent",
-                "tools_count": 7,
-                "description": "Same ReAct agent with tool complexity that reveals limitations"
-            },
-            3.1: {
-                "name": "ReWOO - Reasoning Without Observation",
-                "tools_count": 7,
-                "description": "Plans all steps upfront, then executes - only 2 LLM calls vs N+1"
-            },
-            3.2: {
-                "name": "Reflection - Self-Critique Pattern",
-                "tools_count": 7,
-                "description": "Coming soon - Agent reflects on and improves its outputs"
-            },
-            3.3: {
-                "name": "Plan-and-Execute - Hierarchical Planning",
-                "tools_count": 7,
-                "description": "Coming soon - Separates planning from execution"
-            },
-            "4.11": {
-                "name": "Supervisor 1 - Built-in create_supervisor()",
-                "tools_count": 3,
-                "description": "Production-ready supervisor using LangGraph's built-in function"
-            },
-            "4.12": {
-                "name": "Supervisor 2 - Custom Implementation",
-                "tools_count": 3,
-                "description": "Educational supervisor showing full coordination mechanics"
-            }
-        },
+        "available_stages": STAGES_INFO,
         "current_stage": get_current_stage()
     }
 
@@ -206,12 +212,13 @@ async def list_stages():
 @app.post("/checkpointing/{enabled}")
 async def toggle_checkpointing(enabled: bool):
     """Enable or disable checkpointing and restart workflow."""
+    await _wait_for_warmup()
     try:
         current_stage = get_current_stage()
         
         # Check if current workflow supports checkpointing (inherits from BaseWorkflow)
         current_workflow = get_workflow(current_stage)
-        stage_supports_checkpointing = hasattr(current_workflow, 'enable_checkpointing')
+        stage_supports_checkpointing = current_workflow is not None and current_workflow.capabilities.supports_checkpointing
         
         if enabled and not stage_supports_checkpointing:
             return {
@@ -227,16 +234,16 @@ async def toggle_checkpointing(enabled: bool):
         from common.config import config
         config.ENABLE_CHECKPOINTING = enabled
         
-        # Force reload workflow with new checkpointing setting by clearing cache
-        workflows.pop(current_stage, None)
-        workflow = load_workflow(current_stage)
+        # Every cached stage was built with the old setting, so drop them all before reloading
+        await run_in_threadpool(reset_workflows)
+        workflow = await load_workflow_async(current_stage)
         
         return {
             "message": f"Checkpointing {'enabled' if enabled else 'disabled'} for Stage {current_stage}",
             "checkpointing_enabled": enabled,
             "stage": current_stage,
             "workflow_reloaded": True,
-            "has_checkpointer": hasattr(workflow, 'checkpointer') and workflow.checkpointer is not None,
+            "has_checkpointer": workflow.capabilities.has_checkpointer,
             "stage_supports_checkpointing": stage_supports_checkpointing
         }
     except Exception as e:
@@ -249,11 +256,11 @@ async def get_checkpointing_status():
     """Get current checkpointing status."""
     workflow = get_workflow()
     current_stage_num = get_current_stage()
-    stage_supports_checkpointing = hasattr(workflow, 'enable_checkpointing') if workflow else False
+    stage_supports_checkpointing = workflow.capabilities.supports_checkpointing if workflow else False
     
     return {
         "checkpointing_enabled": config.ENABLE_CHECKPOINTING,
-        "workflow_has_checkpointer": hasattr(workflow, 'checkpointer') and workflow.checkpointer is not None if workflow else False,
+        "workflow_has_checkpointer": workflow.capabilities.has_checkpointer if workflow else False,
         "workflow_supports_checkpointing": stage_supports_checkpointing,
         "stage_supports_checkpointing": stage_supports_checkpointing,
         "current_stage": current_stage_num,
@@ -282,22 +289,10 @@ async def get_checkpoint_history(thread_id: str, limit: int = Query(10, descript
         raise HTTPException(status_code=400, detail="Checkpointing not enabled")
     
     try:
-        history = workflow.get_state_history(thread_id, limit=limit)
+        history = await workflow.aget_state_history(thread_id, limit=limit)
         
         # Format checkpoints for frontend
-        checkpoints = []
-        for i, checkpoint in enumerate(history):
-            checkpoint_data = {
-                "index": i,
-                "checkpoint_id": checkpoint.config.get("configurable", {}).get("checkpoint_id"),
-                "step": checkpoint.metadata.get("step", "unknown"),
-                "next_nodes": list(checkpoint.next) if checkpoint.next else [],
-                "created_at": checkpoint.created_at,
-                "has_plan": "plan_string" in checkpoint.values,
-                "evidence_count": len(checkpoint.values.get("results", {})),
-                "message_count": len(checkpoint.values.get("messages", []))
-            }
-            checkpoints.append(checkpoint_data)
+        checkpoints = [_format_checkpoint(i, checkpoint) for i, checkpoint in enumerate(history)]
         
         return {
             "thread_id": thread_id,
@@ -310,6 +305,21 @@ async def get_checkpoint_history(thread_id: str, limit: int = Query(10, descript
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _format_checkpoint(index: int, checkpoint) -> dict:
+    """Summarize a StateSnapshot for the checkpoint history view."""
+    values = checkpoint.values
+    return {
+        "index": index,
+        "checkpoint_id": (checkpoint.config.get("configurable") or {}).get("checkpoint_id"),
+        "step": (checkpoint.metadata or {}).get("step", "unknown"),
+        "next_nodes": list(checkpoint.next) if checkpoint.next else [],
+        "created_at": checkpoint.created_at,
+        "has_plan": "plan_string" in values,
+        "evidence_count": len(values.get("results", {})),
+        "message_count": len(values.get("messages", []))
+    }
+
+
 @app.post("/checkpoint/reset/{thread_id}/{checkpoint_id}")
 async def reset_to_checkpoint(thread_id: str, checkpoint_id: str):
     """
@@ -343,14 +353,14 @@ async def reset_to_checkpoint(thread_id: str, checkpoint_id: str):
             }
         }
         
-        target_state = workflow.workflow.get_state(config)
+        target_state = await workflow.workflow.aget_state(config)
         
         if not target_state:
             raise HTTPException(status_code=404, detail="Checkpoint not found")
         
         # Update state to the target checkpoint values
         # This effectively truncates history by resetting to that point
-        workflow.workflow.update_state(config, target_state.values)
+        await workflow.workflow.aupdate_state(config, target_state.values)
         
         return {
             "message": f"Reset thread {thread_id} to checkpoint {checkpoint_id}",
@@ -366,8 +376,48 @@ async def reset_to_checkpoint(thread_id: str, checkpoint_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Keep proxies from caching or buffering event streams
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+SSE_GZIP_HEADERS = {**SSE_HEADERS, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Check whether an Accept-Encoding header allows gzip.
+    
+    An explicit "gzip" entry wins over the "*" wildcard, and a coding
+    listed with q=0 is refused.
+    
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        
+    Returns:
+        True if gzip has a non-zero quality value
+    """
+    qualities = {}
+    for entry in accept_encoding.lower().split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
 @app.post("/chat")
-async def chat(request: ChatRequest, stage_param: float = Query(None, description="Override stage")):
+async def chat(request: ChatRequest, http_request: Request, stage_param: float = Query(None, description="Override stage")):
     """
     Chat with the customer support agent.
     
@@ -376,13 +426,15 @@ async def chat(request: ChatRequest, stage_param: float = Query(None, descriptio
         stage_param: Optional stage override (1, 2, 3.1, 3.2, 3.3)
         
     Returns:
-        StreamingResponse if stream=True, ChatResponse otherwise
+        StreamingResponse if stream=True, ChatResponse-shaped JSON otherwise
     """
     # Determine which stage to use
-    target_stage = stage_param or request.stage or get_current_stage() or 1
+    explicit_stage = stage_param or request.stage
+    await _wait_for_warmup(explicit_stage)
+    target_stage = explicit_stage or get_current_stage() or 1
     
     # Load appropriate workflow
-    workflow = load_workflow(target_stage)
+    workflow = await load_workflow_async(target_stage)
     
     logger.info(f"Chat request - stage: {target_stage}, message: '{request.message[:100]}...', stream: {request.stream}")
     
@@ -391,13 +443,26 @@ async def chat(request: ChatRequest, stage_param: float = Query(None, descriptio
     session_id, thread_id = session_manager.get_or_create_thread_id(request.session_id)
     
     if request.stream:
+        # Imported on first streaming request; non-streaming deployments never need it
+        from backend.streaming import gzip_sse, stream_agent_response
+        
+        events = stream_agent_response(request.message, target_stage, thread_id, workflow)
+        headers = SSE_HEADERS
+        
+        # GZipMiddleware skips event streams, so compress here with a flush per event
+        if _accepts_gzip(http_request.headers.get("accept-encoding", "")):
+            events = gzip_sse(events)
+            headers = SSE_GZIP_HEADERS
+        
         return StreamingResponse(
-            stream_agent_response(request.message, target_stage, thread_id),
-            media_type="text/event-stream"
+            events,
+            media_type="text/event-stream",
+            headers=headers
         )
     else:
         try:
-            result = workflow.invoke(request.message, thread_id=thread_id)
+            # ainvoke runs the workflow in a worker thread so other requests keep being served
+            result = await workflow.ainvoke(request.message, thread_id=thread_id)
             
             # Extract response using helper
             final_response, thought_process = extract_response(result, target_stage)
@@ -406,15 +471,17 @@ async def chat(request: ChatRequest, stage_param: float = Query(None, descriptio
             response_data = {
                 "response": final_response,
                 "thought_process": thought_process,
-                "stage": target_stage,
-                "thread_id": thread_id
+                "stage": normalize_stage(target_stage),
+                "thread_id": thread_id,
+                "struggle_stats": None
             }
             
             # Add struggle stats for Stage 2
-            if target_stage == 2 and hasattr(workflow, 'get_struggle_stats'):
+            if response_data["stage"] == "2" and workflow.capabilities.has_struggle_stats:
                 response_data["struggle_stats"] = result.get("struggle_stats", {})
             
-            return ChatResponse(**response_data)
+            # Serialize directly; the fields match ChatResponse, so skip model validation and jsonable_encoder
+            return ORJSONResponse(response_data)
             
         except Exception as e:
             logger.error(f"Chat error: {str(e)}")
@@ -424,12 +491,13 @@ async def chat(request: ChatRequest, stage_param: float = Query(None, descriptio
 if __name__ == "__main__":
     import uvicorn
     
-    # Load stage from config
-    load_workflow(config.STAGE)
-    
+    # Workers need an import string; each one loads its stage in the background on startup.
+    # Sessions and in-memory checkpoints are per process, so multiple workers need sticky routing.
     uvicorn.run(
-        app,
+        "backend.api:app",
         host=config.BACKEND_HOST,
         port=config.BACKEND_PORT,
+        workers=config.BACKEND_WORKERS,
+        timeout_keep_alive=75,
         log_level=config.LOG_LEVEL.lower()
     )
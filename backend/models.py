@@ -16,6 +16,6 @@ class ChatResponse(BaseModel):
     """Response model for non-streaming chat."""
     response: str
     thought_process: list
-    stage: int
+    stage: str  # Canonical stage id, e.g. "2", "3.1", "4.1.1"
     thread_id: str = None
     struggle_stats: dict = None
@@ -41,7 +41,7 @@ def _extract_stage3_response(result: dict) -> tuple[str, list]:
             thought_process.append({
                 "type": "tool_result",
                 "step": step_name,
-                "content": step_result[:200] + "..." if len(step_result) > 200 else step_result
+                "content": truncate(step_result)
             })
     
     return final_response, thought_process
@@ -53,30 +53,39 @@ def _extract_stage12_response(result: dict) -> tuple[str, list]:
     final_response = ""
     thought_process = []
     
+    # With checkpointing, messages include earlier turns; only parse this turn's messages
+    offset = result.get("new_message_offset", 0)
+    
     # Parse messages to extract response and thought process
-    for msg in messages:
-        if hasattr(msg, "type"):
-            if msg.type == "ai":
-                if hasattr(msg, "tool_calls") and msg.tool_calls:
-                    # Agent decided to use tools
-                    for tool_call in msg.tool_calls:
-                        thought_process.append({
-                            "type": "tool_call",
-                            "tool": tool_call["name"],
-                            "args": tool_call["args"]
-                        })
-                elif msg.content:
-                    # Final response from agent
-                    final_response = msg.content
+    for msg in messages[offset:]:
+        msg_type = getattr(msg, "type", None)
+        if msg_type == "ai":
+            tool_calls = getattr(msg, "tool_calls", None)
+            if tool_calls:
+                # Agent decided to use tools
+                for tool_call in tool_calls:
                     thought_process.append({
-                        "type": "response",
-                        "content": msg.content
+                        "type": "tool_call",
+                        "tool": tool_call["name"],
+                        "args": tool_call["args"]
                     })
-            elif msg.type == "tool":
-                # Tool result
+            elif msg.content:
+                # Final response from agent
+                final_response = msg.content
                 thought_process.append({
-                    "type": "tool_result",
-                    "content": msg.content[:200] + "..." if len(msg.content) > 200 else msg.content
+                    "type": "response",
+                    "content": final_response
                 })
+        elif msg_type == "tool":
+            # Tool result
+            thought_process.append({
+                "type": "tool_result",
+                "content": truncate(msg.content)
+            })
     
     return final_response, thought_process
+
+
+def truncate(text: str, limit: int = 200) -> str:
+    """Shorten text for the thought process, marking it with an ellipsis when cut."""
+    return text if len(text) <= limit else text[:limit] + "..."
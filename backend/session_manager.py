@@ -2,10 +2,14 @@
 Session management for tracking thread_ids across requests.
 Enables checkpointing to work with stateless HTTP requests.
 """
+from collections import OrderedDict
 from typing import Dict, Optional
-import uuid
+import asyncio
+import threading
+import secrets
 from datetime import datetime, timedelta
 
+from common.config import config
 from common.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -19,16 +23,20 @@ class SessionManager:
     is used for all requests in a session, enabling conversation memory.
     """
     
-    def __init__(self, session_timeout_minutes: int = 60):
+    def __init__(self, session_timeout_minutes: int = 60, max_sessions: int = 10000):
         """
         Initialize session manager.
         
         Args:
             session_timeout_minutes: Minutes before session expires
+            max_sessions: Maximum sessions kept; least recently used are evicted beyond this
         """
-        self._sessions: Dict[str, Dict] = {}
+        # Ordered by last access (oldest first) so expiry only inspects the front
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
         self._timeout_minutes = session_timeout_minutes
-        logger.info(f"SessionManager initialized - timeout: {session_timeout_minutes}min")
+        self._max_sessions = max_sessions
+        self._lock = threading.Lock()
+        logger.info(f"SessionManager initialized - timeout: {session_timeout_minutes}min, max sessions: {max_sessions}")
     
     def get_or_create_thread_id(self, session_id: Optional[str] = None) -> tuple[str, str]:
         """
@@ -42,51 +50,73 @@ class SessionManager:
         """
         # Generate session_id if not provided
         if session_id is None:
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_hex(16)
             logger.debug(f"Generated new session_id: {session_id}")
         
-        # Clean expired sessions
-        self._cleanup_expired()
-        
-        # Get or create session
-        if session_id in self._sessions:
-            session = self._sessions[session_id]
-            session['last_accessed'] = datetime.now()
-            thread_id = session['thread_id']
-            logger.debug(f"Reusing thread_id for session {session_id}: {thread_id}")
-        else:
-            thread_id = str(uuid.uuid4())
-            self._sessions[session_id] = {
-                'thread_id': thread_id,
-                'created_at': datetime.now(),
-                'last_accessed': datetime.now()
-            }
-            logger.info(f"Created new session {session_id} with thread_id: {thread_id}")
+        with self._lock:
+            # Clean expired sessions
+            self._cleanup_expired()
+            
+            # Get or create session
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session['last_accessed'] = datetime.now()
+                self._sessions.move_to_end(session_id)
+                thread_id = session['thread_id']
+                logger.debug(f"Reusing thread_id for session {session_id}: {thread_id}")
+            else:
+                thread_id = secrets.token_hex(16)
+                now = datetime.now()
+                self._sessions[session_id] = {
+                    'thread_id': thread_id,
+                    'created_at': now,
+                    'last_accessed': now
+                }
+                logger.info(f"Created new session {session_id} with thread_id: {thread_id}")
+                
+                # Evict least recently used sessions beyond the cap
+                while len(self._sessions) > self._max_sessions:
+                    evicted_sid, _ = self._sessions.popitem(last=False)
+                    logger.debug(f"Evicted session over capacity: {evicted_sid}")
         
         return session_id, thread_id
     
     def _cleanup_expired(self):
-        """Remove expired sessions."""
+        """Remove expired sessions. Caller must hold the lock."""
         now = datetime.now()
         timeout_delta = timedelta(minutes=self._timeout_minutes)
         
-        expired = [
-            sid for sid, sess in self._sessions.items()
-            if now - sess['last_accessed'] > timeout_delta
-        ]
-        
-        for sid in expired:
-            del self._sessions[sid]
+        # Sessions are kept in access order, so stop at the first live one
+        while self._sessions:
+            sid, sess = next(iter(self._sessions.items()))
+            if now - sess['last_accessed'] <= timeout_delta:
+                break
+            self._sessions.popitem(last=False)
             logger.debug(f"Removed expired session: {sid}")
     
+    async def sweep_periodically(self, interval_seconds: float = 60):
+        """
+        Remove expired sessions on a fixed interval.
+        
+        Lets idle processes release session memory without waiting for a request.
+        
+        Args:
+            interval_seconds: Seconds between sweeps
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            with self._lock:
+                self._cleanup_expired()
+    
     def get_session_count(self) -> int:
         """Get active session count."""
-        self._cleanup_expired()
-        return len(self._sessions)
+        with self._lock:
+            self._cleanup_expired()
+            return len(self._sessions)
 
 
 # Global session manager instance
-_session_manager = SessionManager()
+_session_manager = SessionManager(max_sessions=config.MAX_SESSIONS)
 
 
 def get_session_manager() -> SessionManager:
@@ -1,17 +1,42 @@
 """
 Streaming response handlers for different agent stages.
 """
-import json
-import asyncio
+import re
+import zlib
+from functools import lru_cache
 from typing import AsyncGenerator, Generator, Union
 
+import orjson
+
+from backend.response_handler import truncate
 from common.logging_config import get_logger
-from backend.workflow_loader import load_workflow
 
 logger = get_logger(__name__)
 
+# Final responses are sent in frames of at least this many characters,
+# flushed early at sentence ends, rather than one frame per word
+CHUNK_MIN_CHARS = 64
+_SENTENCE_END = (".", "!", "?")
+_WORD_WITH_SPACE = re.compile(r'\S+\s*|\s+')
+
+# Static frames are serialized once at import time
+RESPONSE_START_SSE = b'data: {"type":"response_start"}\n\n'
+# Response chunks carry only their content; the client appends it to the open response
+RESPONSE_CHUNK_PREFIX = b'data: {"type":"response_chunk","content":'
+
+# Stage 4.1 built-in specialist node names
+SPECIALIST_NODES = frozenset({"order_operations", "product_inventory", "customer_account"})
+_SPECIALIST_EMOJI = {"order_operations": "📦", "product_inventory": "🛍️", "customer_account": "👤"}
+
+# Specialist response summaries, checked in priority order
+_KEY_INFO_PATTERNS = (
+    (re.compile(r"delivered", re.IGNORECASE), "Order delivered"),
+    (re.compile(r"in stock|available", re.IGNORECASE), "Product availability checked"),
+    (re.compile(r"faq|policy", re.IGNORECASE), "Policy information found"),
+)
 
-async def stream_agent_response(message: str, stage: Union[int, float], thread_id: str = None) -> AsyncGenerator[str, None]:
+
+async def stream_agent_response(message: str, stage: Union[int, float], thread_id: str = None, workflow=None) -> AsyncGenerator[bytes, None]:
     """
     Stream agent response with stage-specific handling.
     
@@ -19,94 +44,158 @@ async def stream_agent_response(message: str, stage: Union[int, float], thread_i
         message: User's message
         stage: Stage number (1, 2, 3.1, 3.2, 3.3)
         thread_id: Optional thread_id for checkpointing
+        workflow: Already-loaded workflow for the stage (looked up if omitted)
         
     Yields:
         Server-Sent Events formatted data
     """
+    from backend.workflow_loader import load_workflow_async, normalize_stage
+    
     try:
-        workflow = load_workflow(stage)
+        if workflow is None:
+            workflow = await load_workflow_async(stage)
         
         # Send thread_id at start of stream for frontend tracking
         if thread_id:
-            initial_event = {"type": "thread_id", "thread_id": thread_id}
-            yield f"data: {json.dumps(initial_event)}\n\n"
+            # thread_id may come from the client, so it is still JSON-escaped
+            yield b'data: {"type":"thread_id","thread_id":' + orjson.dumps(thread_id) + b'}\n\n'
         
         # Track Stage 4 flow per stream (not globally)
+        is_stage4 = str(stage).startswith("4")
         stage4_tools_executed = False
-        stage4_chunks_seen = []
+        
+        # Stage 2 attaches struggle stats to agent chunks; reuse them for completion events
+        struggle_stats = None
+        
+        # Nodes whose handlers only need (node_output, stage); resolved once per stream
+        handlers = {
+            # Stage 3 nodes: plan, tool, solve
+            "plan": _handle_plan_node,
+            "tool": _handle_tool_node,
+            "solve": _handle_solve_node,
+            # Stage 4.1 built-in supervisor node (create_supervisor uses different names)
+            "supervisor": _handle_supervisor_node,
+            # Stage 4 shows specialist delegations; Stage 1/2 show tool observations
+            "tools": _handle_stage4_tools_node if is_stage4 else _handle_tools_node,
+        }
         
         # Call stream method based on workflow capabilities
-        if hasattr(workflow, 'enable_checkpointing') and workflow.enable_checkpointing and thread_id:
+        if workflow.capabilities.supports_checkpointing and workflow.enable_checkpointing and thread_id:
             # Workflow supports checkpointing
-            stream_chunks = workflow.stream(message, thread_id)
+            stream_chunks = workflow.astream(message, thread_id)
         else:
             # Workflow doesn't support checkpointing (like Stage 1)
-            stream_chunks = workflow.stream(message)
+            stream_chunks = workflow.astream(message)
         
-        for chunk in stream_chunks:
+        # astream runs each step in a worker thread so LLM calls don't block the event loop
+        async for chunk in stream_chunks:
+            struggle_stats = chunk.get("struggle_stats", struggle_stats)
+            
             # Parse the chunk from each node
             for node_name, node_output in chunk.items():
                 
                 # Track Stage 4 flow
-                if str(stage).startswith("4"):
-                    stage4_chunks_seen.append(node_name)
+                if is_stage4:
                     if node_name == "tools":
                         stage4_tools_executed = True
                     
-                    logger.info(f"Stage {stage} stream chunk - node: {node_name}, output_keys: {list(node_output.keys()) if isinstance(node_output, dict) else 'not_dict'}, tools_executed: {stage4_tools_executed}")
+                    logger.debug("Stage %s stream chunk - node: %s, output_keys: %s, tools_executed: %s", stage, node_name, node_output.keys() if isinstance(node_output, dict) else 'not_dict', stage4_tools_executed)
                 
-                # Stage 3 nodes: plan, tool, solve
-                if node_name == "plan":
-                    for event in _handle_plan_node(node_output, stage):
-                        yield event
-                elif node_name == "tool":
-                    for event in _handle_tool_node(node_output, stage):
-                        yield event
-                elif node_name == "solve":
-                    async for event in _handle_solve_node(node_output, stage):
-                        yield event
-                
-                # Stage 4 built-in supervisor nodes (create_supervisor uses different names)
-                elif node_name == "supervisor":
-                    # Stage 4.1 built-in supervisor node
-                    async for event in _handle_supervisor_node(node_output, stage):
-                        yield event
-                elif node_name in ["order_operations", "product_inventory", "customer_account"]:
+                handler = handlers.get(node_name)
+                if handler is not None:
+                    events = handler(node_output, stage)
+                elif node_name in SPECIALIST_NODES:
                     # Stage 4.1 built-in specialist nodes
-                    for event in _handle_specialist_node(node_name, node_output, stage):
-                        yield event
-                
-                # Stage 4 custom supervisor nodes (create_react_agent uses agent/tools)
+                    events = _handle_specialist_node(node_name, node_output, stage)
                 elif node_name == "agent":
-                    if str(stage).startswith("4"):
-                        # Pass tools execution state to handler
-                        async for event in _handle_stage4_agent_node(node_output, stage, stage4_tools_executed):
-                            yield event
+                    if is_stage4:
+                        # Stage 4 custom supervisor (create_react_agent uses agent/tools)
+                        events = _handle_stage4_agent_node(node_output, stage, stage4_tools_executed)
                     else:
                         # Regular Stage 1/2 agent handling
-                        async for event in _handle_agent_node(node_output, stage, workflow):
-                            yield event
-                elif node_name == "tools":
-                    if str(stage).startswith("4"):
-                        # Stage 4: Show specialist delegations in thought process
-                        for event in _handle_stage4_tools_node(node_output, stage):
-                            yield event
-                    else:
-                        # Regular Stage 1/2 tools handling
-                        for event in _handle_tools_node(node_output, stage):
-                            yield event
+                        events = _handle_agent_node(node_output, stage, workflow, struggle_stats)
+                else:
+                    continue
+                
+                # A node's events are all ready at once, so send them in a single write
+                frames = b"".join(events)
+                if frames:
+                    yield frames
         
         # Send completion event
-        for event in _send_completion_event(stage, workflow):
+        if struggle_stats is None and normalize_stage(stage) == "2" and workflow.capabilities.has_struggle_stats:
+            struggle_stats = workflow.get_struggle_stats()
+        for event in _send_completion_event(stage, struggle_stats):
             yield event
         
     except Exception as e:
         logger.error(f"Stream error: {str(e)}")
         error_event = {"type": "error", "content": str(e)}
-        yield f"data: {json.dumps(error_event)}\n\n"
+        yield _sse(error_event)
+
+
+async def gzip_sse(frames: AsyncGenerator[bytes, None]) -> AsyncGenerator[bytes, None]:
+    """
+    Gzip-encode an SSE stream without holding events back.
+    
+    Every frame is sync-flushed so the client can decode it immediately, while
+    the shared window still compresses the repeated event keys across frames.
+    
+    Args:
+        frames: Server-Sent Events formatted data
+        
+    Yields:
+        Gzip-encoded stream segments
+    """
+    # wbits=31 selects the gzip container expected for Content-Encoding: gzip
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for frame in frames:
+        yield compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
 
 
-def _handle_plan_node(node_output: dict, stage: Union[int, float]) -> Generator[str, None, None]:
+def _sse(event: dict) -> bytes:
+    """Frame an event as a Server-Sent Events data line."""
+    return b"data: " + orjson.dumps(event) + b"\n\n"
+
+
+def _chunk_text(text: str, min_chars: int = CHUNK_MIN_CHARS) -> Generator[str, None, None]:
+    """Group words (with their trailing whitespace) into length-bounded chunks."""
+    buffer = []
+    size = 0
+    for token in _WORD_WITH_SPACE.findall(text):
+        buffer.append(token)
+        size += len(token)
+        if size >= min_chars or token.rstrip().endswith(_SENTENCE_END):
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+@lru_cache(maxsize=64)
+def _display_name(name: str) -> str:
+    """Turn a snake_case node or tool name into a title-cased label."""
+    return name.replace('_', ' ').title()
+
+
+def _stream_response(text: str, stage: Union[int, float], struggle_stats: dict = None) -> Generator[bytes, None, None]:
+    """Emit a final response as start, length-bounded chunk, and completion events."""
+    yield RESPONSE_START_SSE
+    
+    # Only the content is encoded per chunk
+    for chunk_text in _chunk_text(text):
+        yield RESPONSE_CHUNK_PREFIX + orjson.dumps(chunk_text) + b'}\n\n'
+    
+    # Signal response completion, with struggle stats for Stage 2
+    completion_event = {'type': 'response_complete', 'stage': stage}
+    if struggle_stats is not None:
+        completion_event['struggle_stats'] = struggle_stats
+    yield _sse(completion_event)
+
+
+def _handle_plan_node(node_output: dict, stage: Union[int, float]) -> Generator[bytes, None, None]:
     """Handle ReWOO planner node output."""
     plan_string = node_output.get("plan_string", "")
     if plan_string:
@@ -117,49 +206,35 @@ def _handle_plan_node(node_output: dict, stage: Union[int, float]) -> Generator[
             "plan": plan_string,  # Send full plan without truncation
             "stage": stage
         }
-        yield f"data: {json.dumps(event_data)}\n\n"
+        yield _sse(event_data)
 
 
-def _handle_tool_node(node_output: dict, stage: Union[int, float]) -> Generator[str, None, None]:
+def _handle_tool_node(node_output: dict, stage: Union[int, float]) -> Generator[bytes, None, None]:
     """Handle ReWOO worker node output."""
     results = node_output.get("results", {})
     if results:
-        latest_key = list(results.keys())[-1]
+        # Dicts keep insertion order, so the last key is the step just executed
+        latest_key = next(reversed(results))
         latest_result = results[latest_key]
-        content = f"{latest_key}: {latest_result[:200]}..." if len(latest_result) > 200 else f"{latest_key}: {latest_result}"
+        content = f"{latest_key}: {truncate(latest_result, 200)}"
         event_data = {
             "type": "observation",
             "node": "tool",
             "content": content,
             "stage": stage
         }
-        yield f"data: {json.dumps(event_data)}\n\n"
+        yield _sse(event_data)
 
 
-async def _handle_solve_node(node_output: dict, stage: Union[int, float]) -> AsyncGenerator[str, None]:
+def _handle_solve_node(node_output: dict, stage: Union[int, float]) -> Generator[bytes, None, None]:
     """Handle ReWOO solver node output (final response)."""
     result_text = node_output.get("result", "")
     if result_text:
-        yield f"data: {json.dumps({'type': 'response_start'})}\n\n"
-        
-        # Stream word-by-word
-        words = result_text.split(' ')
-        for i, word in enumerate(words):
-            word_with_space = word + (' ' if i < len(words) - 1 else '')
-            event_data = {
-                "type": "response_chunk",
-                "node": "solve",
-                "content": word_with_space,
-                "word_index": i,
-                "total_words": len(words)
-            }
-            yield f"data: {json.dumps(event_data)}\n\n"
-            await asyncio.sleep(0.05)
-        
-        yield f"data: {json.dumps({'type': 'response_complete', 'stage': stage})}\n\n"
+        for event in _stream_response(result_text, stage):
+            yield event
 
 
-async def _handle_agent_node(node_output: dict, stage: Union[int, float], workflow) -> AsyncGenerator[str, None]:
+def _handle_agent_node(node_output: dict, stage: Union[int, float], workflow, struggle_stats: dict = None) -> Generator[bytes, None, None]:
     """Handle Stage 1/2 agent node output."""
     messages = node_output.get("messages", [])
     
@@ -167,10 +242,12 @@ async def _handle_agent_node(node_output: dict, stage: Union[int, float], workfl
         return
     
     msg = messages[-1]
+    tool_calls = getattr(msg, "tool_calls", None)
+    content = getattr(msg, "content", None)
     
     # Check if agent is making tool calls
-    if hasattr(msg, "tool_calls") and msg.tool_calls:
-        for tool_call in msg.tool_calls:
+    if tool_calls:
+        for tool_call in tool_calls:
             event_data = {
                 "type": "thought",
                 "node": "agent",
@@ -180,65 +257,44 @@ async def _handle_agent_node(node_output: dict, stage: Union[int, float], workfl
                     "args": tool_call["args"]
                 },
                 "stage": stage,
-                "tools_available": len(workflow.agent.tools)
+                "tools_available": workflow.capabilities.tools_count
             }
-            yield f"data: {json.dumps(event_data)}\n\n"
+            yield _sse(event_data)
     
     # Check if agent is providing final response
-    elif msg.content:
-        yield f"data: {json.dumps({'type': 'response_start'})}\n\n"
-        
-        # Stream word-by-word
-        words = msg.content.split(' ')
-        for i, word in enumerate(words):
-            word_with_space = word + (' ' if i < len(words) - 1 else '')
-            event_data = {
-                "type": "response_chunk",
-                "node": "agent",
-                "content": word_with_space,
-                "word_index": i,
-                "total_words": len(words)
-            }
-            yield f"data: {json.dumps(event_data)}\n\n"
-            await asyncio.sleep(0.05)
-        
-        # Signal response completion
-        completion_event = {'type': 'response_complete', 'stage': stage}
-        
-        # Add struggle stats for Stage 2
-        if stage == 2 and hasattr(workflow, 'get_struggle_stats'):
-            completion_event['struggle_stats'] = workflow.get_struggle_stats()
-        
-        yield f"data: {json.dumps(completion_event)}\n\n"
+    elif content:
+        for event in _stream_response(content, stage, struggle_stats):
+            yield event
 
 
-def _handle_tools_node(node_output: dict, stage: Union[int, float]) -> Generator[str, None, None]:
+def _handle_tools_node(node_output: dict, stage: Union[int, float]) -> Generator[bytes, None, None]:
     """Handle Stage 1/2 tools node output."""
     messages = node_output.get("messages", [])
     
     if messages:
         for msg in messages:
-            if hasattr(msg, "content"):
+            full_content = getattr(msg, "content", None)
+            if full_content is not None:
                 # Truncate long tool results
-                content = msg.content[:300] + "..." if len(msg.content) > 300 else msg.content
+                content = truncate(full_content, 300)
                 event_data = {
                     "type": "observation",
                     "node": "tools",
                     "content": content,
-                    "full_length": len(msg.content),
+                    "full_length": len(full_content),
                     "stage": stage
                 }
-                yield f"data: {json.dumps(event_data)}\n\n"
+                yield _sse(event_data)
 
 
 
-async def _handle_supervisor_node(node_output: dict, stage: Union[int, float]) -> AsyncGenerator[str, None]:
+def _handle_supervisor_node(node_output: dict, stage: Union[int, float]) -> Generator[bytes, None, None]:
     """Handle Stage 4 built-in supervisor node output."""
     global _stage4_builtin_final_response_started
     
     # Handle case where node_output might be None (coordination phase)
     if not node_output or not isinstance(node_output, dict):
-        logger.info(f"Stage 4 supervisor node - coordination phase (empty output)")
+        logger.debug("Stage 4 supervisor node - coordination phase (empty output)")
         return
         
     messages = node_output.get("messages", [])
@@ -247,10 +303,12 @@ async def _handle_supervisor_node(node_output: dict, stage: Union[int, float]) -
         return
     
     msg = messages[-1]
+    tool_calls = getattr(msg, "tool_calls", None)
+    content = getattr(msg, "content", None)
     
     # Check if supervisor is delegating to specialists
-    if hasattr(msg, "tool_calls") and msg.tool_calls:
-        for tool_call in msg.tool_calls:
+    if tool_calls:
+        for tool_call in tool_calls:
             # Extract specialist consultation info
             specialist_name = tool_call["name"]
             args = tool_call.get("args", {})
@@ -265,36 +323,21 @@ async def _handle_supervisor_node(node_output: dict, stage: Union[int, float]) -
                 },
                 "stage": stage
             }
-            yield f"data: {json.dumps(event_data)}\n\n"
+            yield _sse(event_data)
     
     # Handle supervisor responses - stream substantial content
-    elif msg.content and len(msg.content.strip()) > 20:  # Only filter very short responses
-        logger.info(f"Streaming Stage 4 supervisor response: {msg.content[:100]}...")
-        
-        yield f"data: {json.dumps({'type': 'response_start'})}\n\n"
+    elif content and len(content.strip()) > 20:  # Only filter very short responses
+        logger.debug("Streaming Stage 4 supervisor response: %.100s...", content)
         
-        # Stream word-by-word
-        words = msg.content.split(' ')
-        for i, word in enumerate(words):
-            word_with_space = word + (' ' if i < len(words) - 1 else '')
-            event_data = {
-                "type": "response_chunk",
-                "node": "supervisor",
-                "content": word_with_space,
-                "word_index": i,
-                "total_words": len(words)
-            }
-            yield f"data: {json.dumps(event_data)}\n\n"
-            await asyncio.sleep(0.05)
-        
-        yield f"data: {json.dumps({'type': 'response_complete', 'stage': stage})}\n\n"
+        for event in _stream_response(content, stage):
+            yield event
 
 
-def _handle_specialist_node(specialist_name: str, node_output: dict, stage: Union[int, float]) -> Generator[str, None, None]:
+def _handle_specialist_node(specialist_name: str, node_output: dict, stage: Union[int, float]) -> Generator[bytes, None, None]:
     """Handle Stage 4 specialist node output with detailed interaction info."""
     # Handle case where node_output might be None
     if not node_output or not isinstance(node_output, dict):
-        logger.info(f"Stage 4 specialist {specialist_name} - empty or invalid output: {type(node_output)}")
+        logger.debug("Stage 4 specialist %s - empty or invalid output: %s", specialist_name, type(node_output))
         return
         
     messages = node_output.get("messages", [])
@@ -303,14 +346,16 @@ def _handle_specialist_node(specialist_name: str, node_output: dict, stage: Unio
         return
     
     msg = messages[-1]
+    tool_calls = getattr(msg, "tool_calls", None)
+    content = getattr(msg, "content", None)
     
     # Format specialist name for display
-    display_name = specialist_name.replace('_', ' ').title()
-    specialist_emoji = {"order_operations": "📦", "product_inventory": "🛍️", "customer_account": "👤"}.get(specialist_name, "🤖")
+    display_name = _display_name(specialist_name)
+    specialist_emoji = _SPECIALIST_EMOJI.get(specialist_name, "🤖")
     
     # Check if specialist is using tools
-    if hasattr(msg, "tool_calls") and msg.tool_calls:
-        for tool_call in msg.tool_calls:
+    if tool_calls:
+        for tool_call in tool_calls:
             # Extract meaningful info from tool arguments
             tool_name = tool_call['name']
             args = tool_call.get('args', {})
@@ -324,7 +369,7 @@ def _handle_specialist_node(specialist_name: str, node_output: dict, stage: Unio
                 color = args.get('color', '')
                 args_summary = f"for {product}" + (f" in {color}" if color else "")
             elif tool_name == "search_faq" and "query" in args:
-                query = args['query'][:50] + "..." if len(args['query']) > 50 else args['query']
+                query = truncate(args['query'], 50)
                 args_summary = f'for "{query}"'
             
             event_data = {
@@ -338,22 +383,18 @@ def _handle_specialist_node(specialist_name: str, node_output: dict, stage: Unio
                 },
                 "stage": stage
             }
-            yield f"data: {json.dumps(event_data)}\n\n"
+            yield _sse(event_data)
     
     # Check if specialist is providing response back to supervisor
-    elif msg.content:
+    elif content:
         # Show detailed response with key findings
-        content_preview = msg.content
+        content_preview = content
         
-        # Extract key information for summary
-        if "delivered" in content_preview.lower():
-            key_info = "Order delivered"
-        elif "in stock" in content_preview.lower() or "available" in content_preview.lower():
-            key_info = "Product availability checked"
-        elif "faq" in content_preview.lower() or "policy" in content_preview.lower():
-            key_info = "Policy information found"
-        else:
-            key_info = "Analysis completed"
+        # Extract key information for summary (first matching pattern wins)
+        key_info = next(
+            (label for pattern, label in _KEY_INFO_PATTERNS if pattern.search(content_preview)),
+            "Analysis completed"
+        )
         
         # Show both summary and preview
         event_data = {
@@ -361,18 +402,18 @@ def _handle_specialist_node(specialist_name: str, node_output: dict, stage: Unio
             "node": "specialist",
             "content": f"{specialist_emoji} {display_name}: {key_info}",
             "specialist": specialist_name,
-            "response_detail": content_preview[:200] + "..." if len(content_preview) > 200 else content_preview,
+            "response_detail": truncate(content_preview, 200),
             "stage": stage
         }
-        yield f"data: {json.dumps(event_data)}\n\n"
+        yield _sse(event_data)
 
 
 
-async def _handle_stage4_agent_node(node_output: dict, stage: Union[int, float], tools_executed: bool) -> AsyncGenerator[str, None]:
+def _handle_stage4_agent_node(node_output: dict, stage: Union[int, float], tools_executed: bool) -> Generator[bytes, None, None]:
     """Handle Stage 4 supervisor agent node output."""
     # Handle case where node_output might be None
     if not node_output or not isinstance(node_output, dict):
-        logger.info(f"Stage 4 custom agent node - empty or invalid output: {type(node_output)}")
+        logger.debug("Stage 4 custom agent node - empty or invalid output: %s", type(node_output))
         return
         
     messages = node_output.get("messages", [])
@@ -381,11 +422,13 @@ async def _handle_stage4_agent_node(node_output: dict, stage: Union[int, float],
         return
     
     msg = messages[-1]
+    tool_calls = getattr(msg, "tool_calls", None)
+    content = getattr(msg, "content", None)
     
     # Check if supervisor is delegating to specialists
-    if hasattr(msg, "tool_calls") and msg.tool_calls:
+    if tool_calls:
         # This is delegation phase
-        for tool_call in msg.tool_calls:
+        for tool_call in tool_calls:
             event_data = {
                 "type": "thought",
                 "node": "agent",
@@ -396,41 +439,26 @@ async def _handle_stage4_agent_node(node_output: dict, stage: Union[int, float],
                 },
                 "stage": stage
             }
-            yield f"data: {json.dumps(event_data)}\n\n"
+            yield _sse(event_data)
     
     # Handle final supervisor response (after specialists have executed) 
-    elif msg.content and tools_executed:
+    elif content and tools_executed:
         # For Stage 4, always stream the response after tools have executed
         # (The supervisor may have tool_calls in message history but not be making new calls)
-        logger.info(f"Streaming Stage 4 supervisor response (after specialists completed): {msg.content[:100]}...")
-        
-        yield f"data: {json.dumps({'type': 'response_start'})}\n\n"
+        logger.debug("Streaming Stage 4 supervisor response (after specialists completed): %.100s...", content)
         
-        # Stream word-by-word
-        words = msg.content.split(' ')
-        for i, word in enumerate(words):
-            word_with_space = word + (' ' if i < len(words) - 1 else '')
-            event_data = {
-                "type": "response_chunk",
-                "node": "agent",
-                "content": word_with_space,
-                "word_index": i,
-                "total_words": len(words)
-            }
-            yield f"data: {json.dumps(event_data)}\n\n"
-            await asyncio.sleep(0.05)
-        
-        yield f"data: {json.dumps({'type': 'response_complete', 'stage': stage})}\n\n"
+        for event in _stream_response(content, stage):
+            yield event
     else:
         # Log skipped responses for debugging
-        logger.info(f"Stage 4 agent - skipping response (tools_executed: {tools_executed}, has_content: {bool(msg.content)}, has_tool_calls: {hasattr(msg, 'tool_calls')})")
+        logger.debug("Stage 4 agent - skipping response (tools_executed: %s, has_content: %s, has_tool_calls: %s)", tools_executed, bool(content), tool_calls is not None)
 
 
-def _handle_stage4_tools_node(node_output: dict, stage: Union[int, float]) -> Generator[str, None, None]:
+def _handle_stage4_tools_node(node_output: dict, stage: Union[int, float]) -> Generator[bytes, None, None]:
     """Handle Stage 4 specialist tools node output."""
     # Handle case where node_output might be None
     if not node_output or not isinstance(node_output, dict):
-        logger.info(f"Stage 4 tools node - empty or invalid output: {type(node_output)}")
+        logger.debug("Stage 4 tools node - empty or invalid output: %s", type(node_output))
         return
         
     messages = node_output.get("messages", [])
@@ -441,10 +469,10 @@ def _handle_stage4_tools_node(node_output: dict, stage: Union[int, float]) -> Ge
     # For Stage 4, tools node contains specialist responses
     # Show these as specialist completions, not detailed responses
     for msg in messages:
-        if hasattr(msg, "content") and hasattr(msg, "name"):
-            tool_name = msg.name
+        tool_name = getattr(msg, "name", None)
+        if tool_name is not None and hasattr(msg, "content"):
             specialist_name = tool_name.replace('specialist_', '').replace('transfer_to_', '')
-            display_name = specialist_name.replace('_', ' ').title()
+            display_name = _display_name(specialist_name)
             
             event_data = {
                 "type": "observation",
@@ -453,15 +481,15 @@ def _handle_stage4_tools_node(node_output: dict, stage: Union[int, float]) -> Ge
                 "specialist": specialist_name,
                 "stage": stage
             }
-            yield f"data: {json.dumps(event_data)}\n\n"
+            yield _sse(event_data)
 
 
-def _send_completion_event(stage: Union[int, float], workflow) -> Generator[str, None, None]:
+def _send_completion_event(stage: Union[int, float], struggle_stats: dict = None) -> Generator[bytes, None, None]:
     """Send completion event with optional struggle stats."""
     completion_data = {"type": "done", "stage": stage}
     
     # Add struggle stats for Stage 2
-    if str(stage) == "2" and hasattr(workflow, 'get_struggle_stats'):
-        completion_data["struggle_stats"] = workflow.get_struggle_stats()
+    if struggle_stats is not None:
+        completion_data["struggle_stats"] = struggle_stats
     
-    yield f"data: {json.dumps(completion_data)}\n\n"
+    yield _sse(completion_data)
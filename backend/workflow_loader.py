@@ -1,19 +1,30 @@
 """
 Workflow loader for dynamically loading stage-specific workflows.
 """
+import threading
+from types import SimpleNamespace
 from typing import Union
 
+from fastapi.concurrency import run_in_threadpool
+
 from common.config import config
 from common.logging_config import get_logger
 
 logger = get_logger(__name__)
 
-# Global workflow instances
+# Global workflow instances, keyed by canonical stage id
 workflows = {}
 current_stage = None
 
+# One lock per stage so concurrent cold requests build each workflow only once
+_load_lock = threading.Lock()
+_stage_locks = {}
+
+# Alternate spellings of stage ids (e.g. from float parsing) mapped to canonical ids
+_STAGE_ALIASES = {"1.0": "1", "2.0": "2", "4.11": "4.1.1", "4.12": "4.1.2"}
+
 
-def load_workflow(stage_num: Union[int, float, str]):
+def load_workflow(stage_num: Union[int, float, str], make_current: bool = True):
     """
     Dynamically load the appropriate workflow for the given stage.
     
@@ -26,66 +37,206 @@ def load_workflow(stage_num: Union[int, float, str]):
             - "3.3": Plan-and-Execute pattern
             - "4.1.1": Supervisor 1 (built-in)
             - "4.1.2": Supervisor 2 (custom)
+        make_current: Whether to make this the current stage. When False (background
+            warm-up), it only becomes current if no stage has been selected yet.
         
     Returns:
         Workflow instance for the specified stage
     """
     global current_stage
     
-    # Convert to string for consistent comparison
-    stage_str = str(stage_num)
+    # Convert to canonical string for consistent comparison
+    stage_str = normalize_stage(stage_num)
+    
+    # Any previously loaded stage is reused, so switching back and forth is free
+    workflow = workflows.get(stage_str)
+    if workflow is None:
+        with _load_lock:
+            stage_lock = _stage_locks.setdefault(stage_str, threading.Lock())
+        
+        with stage_lock:
+            # Another request may have finished building it while we waited
+            workflow = workflows.get(stage_str)
+            if workflow is None:
+                workflow = _build_workflow(stage_str)
+    
+    if make_current or current_stage is None:
+        current_stage = stage_str
+    return workflow
+
+
+async def load_workflow_async(stage_num: Union[int, float, str]):
+    """
+    Load a workflow without blocking the event loop.
+    
+    Cached workflows are returned directly; first-time loads (module imports,
+    model clients, graph compilation) run in the threadpool.
     
-    if stage_str in workflows and current_stage == stage_str:
-        return workflows[stage_str]
+    Args:
+        stage_num: Stage identifier (string, int, or float)
+        
+    Returns:
+        Workflow instance for the specified stage
+    """
+    if normalize_stage(stage_num) in workflows:
+        return load_workflow(stage_num)
+    return await run_in_threadpool(load_workflow, stage_num)
+
+
+def reset_workflows():
+    """
+    Drop every cached workflow so later loads pick up changed settings.
     
+    Cached workflows capture config at build time (e.g. ENABLE_CHECKPOINTING),
+    so a settings change must invalidate all stages, not just the current one.
+    Waits for any in-flight builds so none is re-registered after the clear.
+    """
+    with _load_lock:
+        stage_locks = [_stage_locks[stage] for stage in sorted(_stage_locks)]
+        for stage_lock in stage_locks:
+            stage_lock.acquire()
+        try:
+            workflows.clear()
+        finally:
+            for stage_lock in stage_locks:
+                stage_lock.release()
+    
+    logger.info("Workflow cache cleared")
+
+
+def _build_workflow(stage_str: str):
+    """Construct and register the workflow for a canonical stage id (caller holds its lock)."""
     logger.info(f"Loading Stage {stage_str} workflow")
     
     try:
-        if stage_str in ["1", "1.0"]:
-            from stage_1.agents.workflow import AgentWorkflow
-            workflow = AgentWorkflow()
-            logger.info(f"Stage 1 workflow loaded - tools: {len(workflow.agent.tools)}")
-            
-        elif stage_str in ["2", "2.0"]:
-            from stage_2.agents.workflow import AgentWorkflow
-            workflow = AgentWorkflow()
-            logger.info(f"Stage 2 workflow loaded - tools: {len(workflow.agent.tools)}")
-            
-        elif stage_str == "3.1":
-            from stage_3.agents.rewoo.workflow import ReWOOWorkflow
-            workflow = ReWOOWorkflow()
-            logger.info(f"Stage 3.1 (ReWOO) workflow loaded - tools: {len(workflow.agent.tools)}")
-            
-        elif stage_str == "3.2":
-            raise ValueError(f"Stage 3.2 (Reflection) not yet implemented")
-            
-        elif stage_str == "3.3":
-            raise ValueError(f"Stage 3.3 (Plan-and-Execute) not yet implemented")
-            
-        elif stage_str in ["4.11", "4.1.1"]:
-            # Stage 4.1.1: Supervisor 1 (built-in create_supervisor)
-            from stage_4.supervisor_1.agents.workflow import SupervisorWorkflow
-            workflow = SupervisorWorkflow()
-            logger.info(f"Stage 4.1.1 (Supervisor 1 - Built-in) workflow loaded - specialists: {len(workflow.specialists)}")
-            
-        elif stage_str in ["4.12", "4.1.2"]:
-            # Stage 4.1.2: Supervisor 2 (custom implementation)
-            from stage_4.supervisor_2.agents.workflow import CustomSupervisorWorkflow
-            workflow = CustomSupervisorWorkflow()
-            logger.info(f"Stage 4.1.2 (Supervisor 2 - Custom) workflow loaded - specialist tools: {len(workflow.specialist_tools)}")
-            
-        else:
+        factory = _FACTORIES.get(stage_str)
+        if factory is None:
+            if stage_str in _PLANNED_STAGES:
+                raise ValueError(f"Stage {stage_str} ({_PLANNED_STAGES[stage_str]}) not yet implemented")
             raise ValueError(f"Unsupported stage: {stage_str}. Available: 1, 2, 3.1, 3.2 (coming soon), 3.3 (coming soon), 4.1.1 (Supervisor 1), 4.1.2 (Supervisor 2)")
+        workflow = factory()
         
+        workflow.capabilities = _describe_capabilities(workflow, stage_str)
         workflows[stage_str] = workflow
-        current_stage = stage_str
         return workflow
         
     except Exception as e:
-        logger.error(f"Failed to load Stage {stage_num} workflow: {str(e)}")
+        logger.error(f"Failed to load Stage {stage_str} workflow: {str(e)}")
         raise
 
 
+def _load_stage_1():
+    from stage_1.agents.workflow import AgentWorkflow
+    workflow = AgentWorkflow()
+    logger.info(f"Stage 1 workflow loaded - tools: {len(workflow.agent.tools)}")
+    return workflow
+
+
+def _load_stage_2():
+    from stage_2.agents.workflow import AgentWorkflow
+    workflow = AgentWorkflow()
+    logger.info(f"Stage 2 workflow loaded - tools: {len(workflow.agent.tools)}")
+    return workflow
+
+
+def _load_stage_3_1():
+    from stage_3.agents.rewoo.workflow import ReWOOWorkflow
+    workflow = ReWOOWorkflow()
+    logger.info(f"Stage 3.1 (ReWOO) workflow loaded - tools: {len(workflow.agent.tools)}")
+    return workflow
+
+
+def _load_stage_4_1_1():
+    # Stage 4.1.1: Supervisor 1 (built-in create_supervisor)
+    from stage_4.supervisor_1.agents.workflow import SupervisorWorkflow
+    workflow = SupervisorWorkflow()
+    logger.info(f"Stage 4.1.1 (Supervisor 1 - Built-in) workflow loaded - specialists: {len(workflow.specialists)}")
+    return workflow
+
+
+def _load_stage_4_1_2():
+    # Stage 4.1.2: Supervisor 2 (custom implementation)
+    from stage_4.supervisor_2.agents.workflow import CustomSupervisorWorkflow
+    workflow = CustomSupervisorWorkflow()
+    logger.info(f"Stage 4.1.2 (Supervisor 2 - Custom) workflow loaded - specialist tools: {len(workflow.specialist_tools)}")
+    return workflow
+
+
+# Canonical stage id -> factory; each factory imports its stage lazily
+_FACTORIES = {
+    "1": _load_stage_1,
+    "2": _load_stage_2,
+    "3.1": _load_stage_3_1,
+    "4.1.1": _load_stage_4_1_1,
+    "4.1.2": _load_stage_4_1_2,
+}
+
+# Stages that are announced but not implemented yet
+_PLANNED_STAGES = {"3.2": "Reflection", "3.3": "Plan-and-Execute"}
+
+
+def normalize_stage(stage_num: Union[int, float, str]) -> str:
+    """Map a stage identifier to the canonical string used as the cache key."""
+    stage_str = str(stage_num)
+    return _STAGE_ALIASES.get(stage_str, stage_str)
+
+
+def _describe_capabilities(workflow, stage_str: str) -> SimpleNamespace:
+    """Probe optional workflow features once so request handlers don't repeat the checks."""
+    tools_info = _describe_tools(workflow, stage_str)
+    return SimpleNamespace(
+        supports_checkpointing=hasattr(workflow, 'enable_checkpointing'),
+        has_checkpointer=getattr(workflow, 'checkpointer', None) is not None,
+        has_struggle_stats=hasattr(workflow, 'get_struggle_stats'),
+        tools_info=tools_info,
+        tools_count=len(tools_info)
+    )
+
+
+def _describe_tools(workflow, stage_str: str) -> list:
+    """Describe the tools exposed by a workflow; tools are fixed once it is built."""
+    tools_info = []
+    
+    # Handle different workflow structures
+    if stage_str == "4.1.1":
+        # Supervisor 1: Show specialist agents
+        if hasattr(workflow, 'specialists'):
+            for name, agent in workflow.specialists.items():
+                tools_info.append({
+                    "name": f"specialist_{name}",
+                    "description": f"Specialist agent for {name.replace('_', ' ')}"
+                })
+    elif stage_str == "4.1.2":
+        # Supervisor 2: Show wrapped specialist tools
+        if hasattr(workflow, 'specialist_tools'):
+            for tool in workflow.specialist_tools:
+                tools_info.append({
+                    "name": tool.name,
+                    "description": getattr(tool, 'description', 'No description available')
+                })
+    else:
+        # Regular workflows with agent.tools
+        if hasattr(workflow, 'agent') and hasattr(workflow.agent, 'tools'):
+            for tool in workflow.agent.tools:
+                if hasattr(tool, 'name'):
+                    tools_info.append({
+                        "name": tool.name,
+                        "description": getattr(tool, 'description', 'No description available')
+                    })
+                elif isinstance(tool, str):
+                    tools_info.append({
+                        "name": tool,
+                        "description": "No description available"
+                    })
+                else:
+                    tools_info.append({
+                        "name": str(tool),
+                        "description": "No description available"
+                    })
+    
+    return tools_info
+
+
 def get_current_stage() -> Union[str, None]:
     """Get the currently loaded stage identifier."""
     return current_stage
@@ -103,4 +254,4 @@ def get_workflow(stage_num: Union[int, float, str] = None):
     """
     if stage_num is None:
         return workflows.get(current_stage)
-    return workflows.get(str(stage_num))
+    return workflows.get(normalize_stage(stage_num))
@@ -2,8 +2,15 @@
 Common utilities shared across all stages of the AI agent tutorial.
 """
 
-from common.model_factory import ModelFactory, ModelType
-
 __version__ = "1.0.0"
 
 __all__ = ["ModelFactory", "ModelType"]
+
+
+def __getattr__(name):
+    # Resolve model factory exports on first access so importing a light submodule
+    # (e.g. common.config) doesn't pull in every LLM provider SDK
+    if name in __all__:
+        from common import model_factory
+        return getattr(model_factory, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
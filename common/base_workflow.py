@@ -2,9 +2,11 @@
 Base workflow class with integrated checkpointing support.
 All workflows inherit from this to ensure consistent behavior.
 """
+from functools import partial
 from typing import Optional, Any
 from abc import ABC, abstractmethod
 
+import anyio
 from langgraph.graph import StateGraph
 from langchain_core.runnables import RunnableConfig
 
@@ -34,7 +36,8 @@ class BaseWorkflow(ABC):
         Args:
             enable_checkpointing: Enable checkpointing (defaults to config.ENABLE_CHECKPOINTING)
         """
-        self.enable_checkpointing = enable_checkpointing or config.ENABLE_CHECKPOINTING
+        # An explicit False (e.g. Stage 1) must win over the config default
+        self.enable_checkpointing = config.ENABLE_CHECKPOINTING if enable_checkpointing is None else enable_checkpointing
         
         # Initialize checkpointer if enabled
         self.checkpointer = create_checkpointer() if self.enable_checkpointing else None
@@ -92,11 +95,28 @@ class BaseWorkflow(ABC):
         # Build config with thread_id if checkpointing enabled
         if self.enable_checkpointing:
             config = create_thread_config(thread_id)
-            logger.debug(f"Invoking with checkpointing - thread_id: {config['configurable']['thread_id']}")
+            logger.debug("Invoking with checkpointing - thread_id: %s", config["configurable"]["thread_id"])
             return self._invoke_impl(user_input, config, **kwargs)
         else:
             return self._invoke_impl(user_input, None, **kwargs)
     
+    async def ainvoke(self, user_input: str, thread_id: Optional[str] = None, **kwargs) -> dict:
+        """
+        Async variant of invoke.
+        
+        Runs the workflow in a worker thread so event-loop callers are not blocked
+        for the whole model round-trip.
+        
+        Args:
+            user_input: User query/task
+            thread_id: Optional thread ID (auto-generated if checkpointing enabled)
+            **kwargs: Additional arguments for invoke
+            
+        Returns:
+            Final state with result
+        """
+        return await anyio.to_thread.run_sync(partial(self.invoke, user_input, thread_id, **kwargs))
+    
     @abstractmethod
     def _invoke_impl(self, user_input: str, config: Optional[RunnableConfig], **kwargs) -> dict:
         """
@@ -127,11 +147,34 @@ class BaseWorkflow(ABC):
         # Build config with thread_id if checkpointing enabled
         if self.enable_checkpointing:
             config = create_thread_config(thread_id)
-            logger.debug(f"Streaming with checkpointing - thread_id: {config['configurable']['thread_id']}")
+            logger.debug("Streaming with checkpointing - thread_id: %s", config["configurable"]["thread_id"])
             yield from self._stream_impl(user_input, config, **kwargs)
         else:
             yield from self._stream_impl(user_input, None, **kwargs)
     
+    async def astream(self, user_input: str, thread_id: Optional[str] = None, **kwargs):
+        """
+        Async variant of stream.
+        
+        Each step of the sync stream runs in a worker thread, so event-loop callers
+        are not blocked by model or tool calls.
+        
+        Args:
+            user_input: User query/task
+            thread_id: Optional thread ID (auto-generated if checkpointing enabled)
+            **kwargs: Additional arguments for stream
+            
+        Yields:
+            State updates as they occur
+        """
+        iterator = self.stream(user_input, thread_id, **kwargs)
+        exhausted = object()
+        while True:
+            chunk = await anyio.to_thread.run_sync(next, iterator, exhausted)
+            if chunk is exhausted:
+                break
+            yield chunk
+    
     @abstractmethod
     def _stream_impl(self, user_input: str, config: Optional[RunnableConfig], **kwargs):
         """
@@ -168,10 +211,49 @@ class BaseWorkflow(ABC):
         config = create_thread_config(thread_id)
         return self.workflow.get_state(config)
     
+    def update_state(self, thread_id: str, values: dict, as_node: Optional[str] = None):
+        """
+        Update the state of a thread (requires checkpointing).
+        
+        Args:
+            thread_id: Thread to update
+            values: Values to update the state with
+            as_node: Optional node name to update as
+            
+        Returns:
+            Updated configuration or None
+        """
+        if not self.enable_checkpointing:
+            logger.warning("Checkpointing not enabled, cannot update state")
+            return None
+        
+        config = create_thread_config(thread_id)
+        return self.workflow.update_state(config, values, as_node=as_node)
+    
     def get_state_history(self, thread_id: str, limit: Optional[int] = None):
         """
         Get state history for a thread (requires checkpointing).
         
+        Args:
+            thread_id: Thread to get history for
+            limit: Maximum number of checkpoints to return
+            
+        Returns:
+            Iterator of StateSnapshot objects (newest first), consumed lazily
+        """
+        if not self.enable_checkpointing:
+            logger.warning("Checkpointing not enabled, cannot get state history")
+            return iter(())
+        
+        config = create_thread_config(thread_id)
+        return self.workflow.get_state_history(config, limit=limit)
+    
+    async def aget_state_history(self, thread_id: str, limit: Optional[int] = None):
+        """
+        Async variant of get_state_history.
+        
+        Uses the checkpointer's async API so database-backed savers don't block the event loop.
+        
         Args:
             thread_id: Thread to get history for
             limit: Maximum number of checkpoints to return
@@ -184,4 +266,4 @@ class BaseWorkflow(ABC):
             return []
         
         config = create_thread_config(thread_id)
-        return list(self.workflow.get_state_history(config, limit=limit))
+        return [snapshot async for snapshot in self.workflow.aget_state_history(config, limit=limit)]
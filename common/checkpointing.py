@@ -3,22 +3,75 @@ Checkpointing utility for Stage 3 patterns using LangGraph built-in persistence.
 Provides in-memory state persistence within conversation sessions.
 """
 
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List
-import uuid
+import secrets
 import logging
+import threading
 from langgraph.checkpoint.memory import InMemorySaver
 
+from common.config import config as app_config
+
 logger = logging.getLogger(__name__)
 
 
+class BoundedInMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer that keeps checkpoints for a bounded number of threads.
+    
+    Threads are tracked in access order; once more than ``max_threads`` threads
+    have checkpoints, the least recently used thread is deleted entirely.
+    """
+    
+    def __init__(self, max_threads: int = 10000, **kwargs):
+        super().__init__(**kwargs)
+        self.max_threads = max_threads
+        self._thread_order: OrderedDict = OrderedDict()
+        self._order_lock = threading.Lock()
+    
+    def get_tuple(self, config):
+        """Fetch a checkpoint tuple, marking its thread as recently used."""
+        self._touch(config, track_new=False)
+        return super().get_tuple(config)
+    
+    def put(self, config, checkpoint, metadata, new_versions):
+        """Store a checkpoint, evicting the least recently used thread if over the cap."""
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        self._touch(config, track_new=True)
+        return next_config
+    
+    def _touch(self, config, track_new: bool):
+        """Mark a thread as recently used and evict the oldest threads over the cap."""
+        thread_id = config.get("configurable", {}).get("thread_id")
+        if thread_id is None:
+            return
+        
+        evicted = []
+        with self._order_lock:
+            if thread_id in self._thread_order:
+                self._thread_order.move_to_end(thread_id)
+            elif track_new:
+                self._thread_order[thread_id] = None
+                while len(self._thread_order) > self.max_threads:
+                    evicted.append(self._thread_order.popitem(last=False)[0])
+        
+        for old_thread_id in evicted:
+            self.delete_thread(old_thread_id)
+            logger.warning(
+                f"Checkpointer over capacity ({self.max_threads} threads) - "
+                f"dropped conversation history for least recently used thread {old_thread_id}"
+            )
+
+
 def create_checkpointer():
     """
     Create a LangGraph in-memory checkpointer.
     
     Returns:
-        InMemorySaver: LangGraph's built-in in-memory checkpointer
+        BoundedInMemorySaver: LangGraph's in-memory checkpointer capped at
+        MAX_SESSIONS conversation threads, matching the session manager's cap
     """
-    return InMemorySaver()
+    return BoundedInMemorySaver(max_threads=app_config.MAX_SESSIONS)
 
 
 def create_thread_config(thread_id: Optional[str] = None) -> Dict[str, Any]:
@@ -32,7 +85,7 @@ def create_thread_config(thread_id: Optional[str] = None) -> Dict[str, Any]:
         Configuration dictionary for LangGraph
     """
     if thread_id is None:
-        thread_id = str(uuid.uuid4())
+        thread_id = secrets.token_hex(16)
     
     return {"configurable": {"thread_id": thread_id}}
 
@@ -52,76 +105,3 @@ def get_checkpoint_config(thread_id: str, checkpoint_id: Optional[str] = None) -
     if checkpoint_id:
         config["configurable"]["checkpoint_id"] = checkpoint_id
     return config
-
-
-class CheckpointHelper:
-    """
-    Helper class for working with LangGraph checkpoints.
-    
-    This class provides convenience methods for managing checkpoints
-    using LangGraph's built-in persistence mechanisms.
-    """
-    
-    def __init__(self, graph):
-        """
-        Initialize checkpoint helper with compiled graph.
-        
-        Args:
-            graph: Compiled LangGraph with checkpointer
-        """
-        self.graph = graph
-    
-    def get_current_state(self, thread_id: str):
-        """
-        Get the current state of a thread.
-        
-        Args:
-            thread_id: Thread to get state for
-            
-        Returns:
-            StateSnapshot object or None if not found
-        """
-        try:
-            config = create_thread_config(thread_id)
-            return self.graph.get_state(config)
-        except Exception as e:
-            logger.error(f"Error getting current state for thread {thread_id}: {e}")
-            return None
-    
-    def get_state_history(self, thread_id: str, limit: Optional[int] = None):
-        """
-        Get the state history for a thread.
-        
-        Args:
-            thread_id: Thread to get history for
-            limit: Maximum number of checkpoints to return
-            
-        Returns:
-            List of StateSnapshot objects
-        """
-        try:
-            config = create_thread_config(thread_id)
-            history = list(self.graph.get_state_history(config, limit=limit))
-            return history
-        except Exception as e:
-            logger.error(f"Error getting state history for thread {thread_id}: {e}")
-            return []
-    
-    def update_state(self, thread_id: str, values: Dict[str, Any], as_node: Optional[str] = None):
-        """
-        Update the state of a thread.
-        
-        Args:
-            thread_id: Thread to update
-            values: Values to update the state with
-            as_node: Optional node name to update as
-            
-        Returns:
-            Updated configuration
-        """
-        try:
-            config = create_thread_config(thread_id)
-            return self.graph.update_state(config, values, as_node=as_node)
-        except Exception as e:
-            logger.error(f"Error updating state for thread {thread_id}: {e}")
-            return None
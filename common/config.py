@@ -8,14 +8,18 @@ from pathlib import Path
 from typing import Optional, Union
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()  # Project root
-
 # Project paths
 BASE_DIR = Path(__file__).parent.parent
 COMMON_DIR = BASE_DIR / "common"
 LOGS_DIR = BASE_DIR / "logs"
 
+# Load environment variables from the project root .env file, if present.
+# Pointing at it directly skips find_dotenv's directory walk; deployments that
+# inject env vars without a .env file skip dotenv entirely.
+_DOTENV_PATH = BASE_DIR / ".env"
+if _DOTENV_PATH.is_file():
+    load_dotenv(_DOTENV_PATH)
+
 # Ensure logs directory exists
 LOGS_DIR.mkdir(exist_ok=True)
 
@@ -56,6 +60,11 @@ def _parse_model_config(env_var: str, default: str = "ollama:llama3.1") -> tuple
     return model_type, model_name
 
 
+def _parse_stage(stage_str: str) -> Union[int, float]:
+    """Parse the STAGE setting as a float for sub-stages (e.g. "3.1") and an int otherwise."""
+    return float(stage_str) if '.' in stage_str else int(stage_str)
+
+
 # Parse model configurations
 _default_type, _default_name = _parse_model_config("DEFAULT_MODEL", "ollama:llama3.1")
 _planner_type, _planner_name = _parse_model_config("PLANNER_MODEL", "ollama:llama3.1")
@@ -89,17 +98,22 @@ class Config:
     MAX_ITERATIONS: int = int(os.getenv("MAX_ITERATIONS", "10"))
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     ENABLE_CHECKPOINTING: bool = os.getenv("ENABLE_CHECKPOINTING", "false").lower() == "true"
+    # Conversation sessions kept before the least recently used is dropped; the in-memory
+    # checkpointer keeps as many threads, so a live session never loses its history
+    MAX_SESSIONS: int = int(os.getenv("MAX_SESSIONS", "10000"))
     
     # Stage Configuration
     # Supports: 1, 2, 3.1 (ReWOO), 3.2 (Reflection), 3.3 (Plan-Execute)
-    STAGE: Union[int, float] = (
-        float(os.getenv("STAGE", "1")) if '.' in os.getenv("STAGE", "1") 
-        else int(os.getenv("STAGE", "1"))
-    )
+    STAGE: Union[int, float] = _parse_stage(os.getenv("STAGE", "1"))
     
     # Backend Configuration
     BACKEND_HOST: str = os.getenv("BACKEND_HOST", "0.0.0.0")
     BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", "8000"))
+    BACKEND_WORKERS: int = int(os.getenv("BACKEND_WORKERS", "1"))
+    # Build the configured stage's workflow at import so `gunicorn --preload` shares it across workers
+    PRELOAD_WORKFLOW: bool = os.getenv("PRELOAD_WORKFLOW", "false").lower() == "true"
+    # Threads available for running blocking workflow calls off the event loop
+    BACKEND_WORKER_THREADS: int = int(os.getenv("BACKEND_WORKER_THREADS", "40"))
     
     @classmethod
     def validate(cls) -> bool:
@@ -109,35 +123,19 @@ class Config:
         Returns:
             True if configuration is valid, False otherwise
         """
-        # Check DEFAULT_MODEL configuration
-        if not cls.OPENAI_API_KEY and cls.DEFAULT_MODEL_TYPE == "openai":
-            print("Warning: OPENAI_API_KEY not set but DEFAULT_MODEL uses 'openai'.")
-            print("Set it in .env file or use a different model provider.")
-            return False
-        if not cls.ANTHROPIC_API_KEY and cls.DEFAULT_MODEL_TYPE == "anthropic":
-            print("Warning: ANTHROPIC_API_KEY not set but DEFAULT_MODEL uses 'anthropic'.")
-            print("Set it in .env file or use a different model provider.")
-            return False
-        
-        # Check PLANNER_MODEL configuration
-        if not cls.OPENAI_API_KEY and cls.PLANNER_MODEL_TYPE == "openai":
-            print("Warning: OPENAI_API_KEY not set but PLANNER_MODEL uses 'openai'.")
-            print("Set it in .env file or use a different model provider.")
-            return False
-        if not cls.ANTHROPIC_API_KEY and cls.PLANNER_MODEL_TYPE == "anthropic":
-            print("Warning: ANTHROPIC_API_KEY not set but PLANNER_MODEL uses 'anthropic'.")
-            print("Set it in .env file or use a different model provider.")
-            return False
+        api_keys = {"openai": cls.OPENAI_API_KEY, "anthropic": cls.ANTHROPIC_API_KEY}
+        model_types = (
+            ("DEFAULT_MODEL", cls.DEFAULT_MODEL_TYPE),
+            ("PLANNER_MODEL", cls.PLANNER_MODEL_TYPE),
+            ("SOLVER_MODEL", cls.SOLVER_MODEL_TYPE),
+        )
         
-        # Check SOLVER_MODEL configuration
-        if not cls.OPENAI_API_KEY and cls.SOLVER_MODEL_TYPE == "openai":
-            print("Warning: OPENAI_API_KEY not set but SOLVER_MODEL uses 'openai'.")
-            print("Set it in .env file or use a different model provider.")
-            return False
-        if not cls.ANTHROPIC_API_KEY and cls.SOLVER_MODEL_TYPE == "anthropic":
-            print("Warning: ANTHROPIC_API_KEY not set but SOLVER_MODEL uses 'anthropic'.")
-            print("Set it in .env file or use a different model provider.")
-            return False
+        # Each configured provider that needs an API key must have one
+        for setting, model_type in model_types:
+            if model_type in api_keys and not api_keys[model_type]:
+                print(f"Warning: {model_type.upper()}_API_KEY not set but {setting} uses '{model_type}'.")
+                print("Set it in .env file or use a different model provider.")
+                return False
         
         return True
 
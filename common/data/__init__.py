@@ -3,16 +3,22 @@ Shared data package for all stages.
 Contains mock data for demonstrations.
 """
 
-from common.data.orders import SAMPLE_ORDERS
-from common.data.faqs import FAQ_DATA
-from common.data.customers import CUSTOMER_ACCOUNTS, get_customer_by_order, get_customer_by_email
-from common.data.inventory import (
-    PRODUCT_INVENTORY, 
-    get_product_inventory, 
-    check_availability, 
-    update_inventory, 
-    reset_inventory
-)
+import importlib
+
+# Exported name -> submodule that defines it. Submodules are imported on first
+# access, so e.g. importing common.data.faqs doesn't build the inventory indexes.
+_LAZY_EXPORTS = {
+    "SAMPLE_ORDERS": "common.data.orders",
+    "FAQ_DATA": "common.data.faqs",
+    "CUSTOMER_ACCOUNTS": "common.data.customers",
+    "get_customer_by_order": "common.data.customers",
+    "get_customer_by_email": "common.data.customers",
+    "PRODUCT_INVENTORY": "common.data.inventory",
+    "get_product_inventory": "common.data.inventory",
+    "check_availability": "common.data.inventory",
+    "update_inventory": "common.data.inventory",
+    "reset_inventory": "common.data.inventory",
+}
 
 __all__ = [
     "SAMPLE_ORDERS", 
@@ -26,3 +32,12 @@ __all__ = [
     "update_inventory", 
     "reset_inventory"
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -3,19 +3,28 @@ Customer account data for the online clothing retailer.
 Contains customer profiles, preferences, and order history.
 """
 
-from datetime import datetime, timedelta
+from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List
 
 # Generate dynamic dates
-today = datetime.now()
+_TODAY_ORDINAL = date.today().toordinal()
 
-CUSTOMER_ACCOUNTS = {
+
+@lru_cache(maxsize=None)
+def _date(offset_days: int) -> str:
+    """Format today's date shifted by offset_days (negative for the past) as YYYY-MM-DD."""
+    return date.fromordinal(_TODAY_ORDINAL + offset_days).isoformat()
+
+
+CUSTOMER_ACCOUNTS = MappingProxyType({
     "customer_12345": {  # Linked to order #12345
         "customer_id": "customer_12345",
         "email": "john.doe@email.com",
         "name": "John Doe",
         "phone": "+1-555-123-4567",
-        "created_date": (today - timedelta(days=365)).strftime("%Y-%m-%d"),
+        "created_date": _date(-365),
         "tier": "Gold",  # Bronze, Silver, Gold, Platinum
         "preferences": {
             "size": "M",
@@ -26,21 +35,21 @@ CUSTOMER_ACCOUNTS = {
         "past_orders": [
             {
                 "order_id": "12345",
-                "date": (today - timedelta(days=10)).strftime("%Y-%m-%d"),
+                "date": _date(-10),
                 "total": 139.97,
                 "status": "delivered",
                 "satisfaction_score": 5
             },
             {
                 "order_id": "11234",
-                "date": (today - timedelta(days=45)).strftime("%Y-%m-%d"),
+                "date": _date(-45),
                 "total": 89.99,
                 "status": "delivered", 
                 "satisfaction_score": 4
             },
             {
                 "order_id": "11001",
-                "date": (today - timedelta(days=120)).strftime("%Y-%m-%d"),
+                "date": _date(-120),
                 "total": 159.98,
                 "status": "delivered",
                 "satisfaction_score": 5
@@ -56,7 +65,7 @@ CUSTOMER_ACCOUNTS = {
         "email": "sarah.smith@email.com",
         "name": "Sarah Smith",
         "phone": "+1-555-234-5678",
-        "created_date": (today - timedelta(days=180)).strftime("%Y-%m-%d"),
+        "created_date": _date(-180),
         "tier": "Silver",
         "preferences": {
             "size": "S",
@@ -67,14 +76,14 @@ CUSTOMER_ACCOUNTS = {
         "past_orders": [
             {
                 "order_id": "12346",
-                "date": (today - timedelta(days=3)).strftime("%Y-%m-%d"),
+                "date": _date(-3),
                 "total": 59.99,
                 "status": "shipped",
                 "satisfaction_score": None
             },
             {
                 "order_id": "11567",
-                "date": (today - timedelta(days=30)).strftime("%Y-%m-%d"),
+                "date": _date(-30),
                 "total": 79.99,
                 "status": "delivered",
                 "satisfaction_score": 3
@@ -90,7 +99,7 @@ CUSTOMER_ACCOUNTS = {
         "email": "mike.wilson@email.com", 
         "name": "Mike Wilson",
         "phone": "+1-555-345-6789",
-        "created_date": today.strftime("%Y-%m-%d"),  # New customer
+        "created_date": _date(0),  # New customer
         "tier": "Bronze",
         "preferences": {
             "size": "L",
@@ -101,7 +110,7 @@ CUSTOMER_ACCOUNTS = {
         "past_orders": [
             {
                 "order_id": "12347", 
-                "date": today.strftime("%Y-%m-%d"),
+                "date": _date(0),
                 "total": 239.98,
                 "status": "processing",
                 "satisfaction_score": None
@@ -112,6 +121,18 @@ CUSTOMER_ACCOUNTS = {
         "returns_count": 0,
         "complaints_count": 0
     }
+})
+
+# Case-insensitive email lookup, built once from the static account data
+_EMAIL_INDEX = {customer["email"].lower(): customer for customer in CUSTOMER_ACCOUNTS.values()}
+
+# Map order IDs to customer IDs
+_ORDER_TO_CUSTOMER = {
+    "12345": "customer_12345",
+    "12346": "customer_12346",
+    "12347": "customer_12347",
+    "12348": "customer_12345",  # John's second order
+    "12349": "customer_12345"   # John's third order
 }
 
 
@@ -125,16 +146,7 @@ def get_customer_by_order(order_id: str) -> Dict:
     Returns:
         Customer data dictionary or None if not found
     """
-    # Map order IDs to customer IDs
-    order_to_customer = {
-        "12345": "customer_12345",
-        "12346": "customer_12346", 
-        "12347": "customer_12347",
-        "12348": "customer_12345",  # John's second order
-        "12349": "customer_12345"   # John's third order
-    }
-    
-    customer_id = order_to_customer.get(order_id)
+    customer_id = _ORDER_TO_CUSTOMER.get(order_id)
     if customer_id:
         return CUSTOMER_ACCOUNTS.get(customer_id)
     return None
@@ -150,7 +162,4 @@ def get_customer_by_email(email: str) -> Dict:
     Returns:
         Customer data dictionary or None if not found
     """
-    for customer in CUSTOMER_ACCOUNTS.values():
-        if customer["email"].lower() == email.lower():
-            return customer
-    return None
+    return _EMAIL_INDEX.get(email.lower())
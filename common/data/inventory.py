@@ -3,9 +3,10 @@ Product inventory data for the online clothing retailer.
 Contains product variants, stock levels, and availability information.
 """
 
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 
-PRODUCT_INVENTORY = {
+PRODUCT_INVENTORY = MappingProxyType({
     # T-Shirts
     "ITEM001": {
         "item_id": "ITEM001",
@@ -114,11 +115,27 @@ PRODUCT_INVENTORY = {
             "burgundy-M": {"color": "burgundy", "size": "M", "stock": 1, "price": 149.99}
         }
     }
-}
+})
+
 
+# Current stock per (item_id, variant_key). PRODUCT_INVENTORY stays pristine;
+# only this flat table is mutated, so a reset is a cheap bulk copy.
+_STOCK: Dict[Tuple[str, str], int] = {
+    (item_id, variant_key): variant["stock"]
+    for item_id, product in PRODUCT_INVENTORY.items()
+    for variant_key, variant in product["variants"].items()
+}
+_ORIGINAL_STOCK = dict(_STOCK)
 
-# Global state for tracking inventory changes (stateful behavior)
-_inventory_state = PRODUCT_INVENTORY.copy()
+# Per-product variant rows with lowercased color/size, so availability
+# filters compare against precomputed strings: (variant_key, color_lc, size_lc, variant)
+_VARIANT_INDEX: Dict[str, List[Tuple[str, str, str, Dict]]] = {
+    item_id: [
+        (variant_key, variant["color"].lower(), variant["size"].lower(), variant)
+        for variant_key, variant in product["variants"].items()
+    ]
+    for item_id, product in PRODUCT_INVENTORY.items()
+}
 
 
 def get_product_inventory(item_id: str) -> Optional[Dict]:
@@ -131,7 +148,17 @@ def get_product_inventory(item_id: str) -> Optional[Dict]:
     Returns:
         Product inventory data or None if not found
     """
-    return _inventory_state.get(item_id)
+    product = PRODUCT_INVENTORY.get(item_id)
+    if not product:
+        return None
+    
+    return {
+        **product,
+        "variants": {
+            variant_key: {**variant, "stock": _STOCK[(item_id, variant_key)]}
+            for variant_key, variant in product["variants"].items()
+        }
+    }
 
 
 def check_availability(item_id: str, color: str = None, size: str = None) -> Dict:
@@ -146,25 +173,28 @@ def check_availability(item_id: str, color: str = None, size: str = None) -> Dic
     Returns:
         Dictionary with availability information
     """
-    product = _inventory_state.get(item_id)
+    product = PRODUCT_INVENTORY.get(item_id)
     if not product:
         return {"available": False, "reason": "Product not found", "variants": []}
     
+    color_lc = color.lower() if color else None
+    size_lc = size.lower() if size else None
     available_variants = []
     
-    for variant_key, variant_data in product["variants"].items():
+    for variant_key, variant_color, variant_size, variant_data in _VARIANT_INDEX[item_id]:
         # Apply filters
-        if color and color.lower() not in variant_data["color"].lower():
+        if color_lc and color_lc not in variant_color:
             continue
-        if size and size.lower() not in variant_data["size"].lower():
+        if size_lc and size_lc not in variant_size:
             continue
         
-        if variant_data["stock"] > 0:
+        stock = _STOCK[(item_id, variant_key)]
+        if stock > 0:
             available_variants.append({
                 "variant": variant_key,
                 "color": variant_data["color"],
                 "size": variant_data["size"],
-                "stock": variant_data["stock"],
+                "stock": stock,
                 "price": variant_data["price"]
             })
     
@@ -189,18 +219,15 @@ def update_inventory(item_id: str, variant_key: str, quantity_change: int) -> bo
     Returns:
         True if update successful, False otherwise
     """
-    product = _inventory_state.get(item_id)
-    if not product or variant_key not in product["variants"]:
+    key = (item_id, variant_key)
+    try:
+        _STOCK[key] = max(0, _STOCK[key] + quantity_change)
+    except KeyError:
         return False
     
-    variant = product["variants"][variant_key]
-    new_stock = max(0, variant["stock"] + quantity_change)
-    variant["stock"] = new_stock
-    
     return True
 
 
 def reset_inventory():
     """Reset inventory to original state (for testing)."""
-    global _inventory_state
-    _inventory_state = PRODUCT_INVENTORY.copy()
+    _STOCK.update(_ORIGINAL_STOCK)
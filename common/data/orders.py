@@ -3,18 +3,27 @@ Sample order data for the mock order database.
 Simulates orders for an online clothing retailer.
 """
 
-from datetime import datetime, timedelta
+from datetime import date
+from functools import lru_cache
+from types import MappingProxyType
 
 # Generate dynamic dates relative to today
-today = datetime.now()
+_TODAY_ORDINAL = date.today().toordinal()
 
-SAMPLE_ORDERS = {
+
+@lru_cache(maxsize=None)
+def _date(offset_days: int) -> str:
+    """Format today's date shifted by offset_days (negative for the past) as YYYY-MM-DD."""
+    return date.fromordinal(_TODAY_ORDINAL + offset_days).isoformat()
+
+
+SAMPLE_ORDERS = MappingProxyType({
     "12345": {
         "order_id": "12345",
         "status": "Delivered",
-        "order_date": (today - timedelta(days=10)).strftime("%Y-%m-%d"),
-        "estimated_delivery": (today - timedelta(days=3)).strftime("%Y-%m-%d"),
-        "actual_delivery": (today - timedelta(days=3)).strftime("%Y-%m-%d"),
+        "order_date": _date(-10),
+        "estimated_delivery": _date(-3),
+        "actual_delivery": _date(-3),
         "tracking_number": "TRK123456789",
         "items": [
             {
@@ -38,8 +47,8 @@ SAMPLE_ORDERS = {
     "12346": {
         "order_id": "12346",
         "status": "Shipped",
-        "order_date": (today - timedelta(days=3)).strftime("%Y-%m-%d"),
-        "estimated_delivery": (today + timedelta(days=2)).strftime("%Y-%m-%d"),
+        "order_date": _date(-3),
+        "estimated_delivery": _date(2),
         "actual_delivery": None,
         "tracking_number": "TRK987654321",
         "items": [
@@ -57,8 +66,8 @@ SAMPLE_ORDERS = {
     "12347": {
         "order_id": "12347",
         "status": "Processing",
-        "order_date": today.strftime("%Y-%m-%d"),
-        "estimated_delivery": (today + timedelta(days=5)).strftime("%Y-%m-%d"),
+        "order_date": _date(0),
+        "estimated_delivery": _date(5),
         "actual_delivery": None,
         "tracking_number": None,
         "items": [
@@ -83,8 +92,8 @@ SAMPLE_ORDERS = {
     "12348": {
         "order_id": "12348",
         "status": "Shipped",
-        "order_date": (today - timedelta(days=5)).strftime("%Y-%m-%d"),
-        "estimated_delivery": (today + timedelta(days=1)).strftime("%Y-%m-%d"),
+        "order_date": _date(-5),
+        "estimated_delivery": _date(1),
         "actual_delivery": None,
         "tracking_number": "TRK456789123",
         "items": [
@@ -102,9 +111,9 @@ SAMPLE_ORDERS = {
     "12349": {
         "order_id": "12349",
         "status": "Delivered",
-        "order_date": (today - timedelta(days=15)).strftime("%Y-%m-%d"),
-        "estimated_delivery": (today - timedelta(days=8)).strftime("%Y-%m-%d"),
-        "actual_delivery": (today - timedelta(days=7)).strftime("%Y-%m-%d"),
+        "order_date": _date(-15),
+        "estimated_delivery": _date(-8),
+        "actual_delivery": _date(-7),
         "tracking_number": "TRK789123456",
         "items": [
             {
@@ -118,4 +127,4 @@ SAMPLE_ORDERS = {
         "total": 149.99,
         "shipping_address": "654 Maple Dr, Boston, MA 02101"
     }
-}
+})
@@ -3,10 +3,11 @@ Performance metrics tracking for Stage 3 patterns.
 Provides comprehensive metrics comparison between different agent patterns.
 """
 
+import sys
 import time
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
 logger = logging.getLogger(__name__)
@@ -20,7 +21,11 @@ class PatternType(Enum):
     REACT = "react"  # For comparison with Stage 2
 
 
-@dataclass
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+; 3.9 falls back to a regular one
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ExecutionMetrics:
     """Metrics for a single agent execution."""
     
@@ -77,6 +82,20 @@ class ExecutionMetrics:
         return max(0.0, base_score - iteration_penalty - time_penalty)
 
 
+# Names accepted as metric updates; checked instead of hasattr() on every kwarg
+_METRIC_FIELDS = frozenset(f.name for f in fields(ExecutionMetrics))
+
+_REPORT_HEADER = (
+    "# Stage 3 Pattern Comparison Report\n\n"
+    "| Pattern | Avg Time (s) | Avg Iterations | Avg Tool Calls | Success Rate | Efficiency Score | Executions |\n"
+    "|---------|--------------|----------------|----------------|--------------|------------------|------------|\n"
+)
+_REPORT_ROW = (
+    "| {name} | {avg_execution_time:.2f} | {avg_iterations:.1f} | {avg_tool_calls:.1f} | "
+    "{success_rate:.1%} | {avg_efficiency_score:.2f} | {execution_count} |\n"
+)
+
+
 class MetricsTracker:
     """
     Tracks and analyzes performance metrics for different agent patterns.
@@ -87,6 +106,25 @@ class MetricsTracker:
     def __init__(self):
         self._metrics: List[ExecutionMetrics] = []
         self._active_executions: Dict[str, ExecutionMetrics] = {}
+        # First completed execution per session, mirroring a front-to-back scan of _metrics
+        self._by_session: Dict[str, ExecutionMetrics] = {}
+        # Running per-pattern totals so comparisons don't rescan the full history
+        self._pattern_totals: Dict[PatternType, Dict[str, float]] = {
+            pattern_type: self._empty_totals() for pattern_type in PatternType
+        }
+    
+    @staticmethod
+    def _empty_totals() -> Dict[str, float]:
+        """Create a zeroed set of running totals for one pattern."""
+        return {
+            'execution_time': 0.0,
+            'iterations': 0,
+            'tool_calls': 0,
+            'successes': 0,
+            'tool_success_rate': 0.0,
+            'efficiency_score': 0.0,
+            'count': 0
+        }
     
     def start_execution(
         self, 
@@ -132,7 +170,7 @@ class MetricsTracker:
         metrics = self._active_executions[session_id]
         
         for key, value in kwargs.items():
-            if hasattr(metrics, key):
+            if key in _METRIC_FIELDS:
                 setattr(metrics, key, value)
         
         return metrics
@@ -167,10 +205,20 @@ class MetricsTracker:
         
         # Apply any final metric updates
         for key, value in final_metrics.items():
-            if hasattr(metrics, key):
+            if key in _METRIC_FIELDS:
                 setattr(metrics, key, value)
         
         self._metrics.append(metrics)
+        self._by_session.setdefault(session_id, metrics)
+        
+        totals = self._pattern_totals[metrics.pattern_type]
+        totals['execution_time'] += metrics.total_execution_time
+        totals['iterations'] += metrics.total_iterations
+        totals['tool_calls'] += metrics.tool_calls_count
+        totals['successes'] += metrics.success
+        totals['tool_success_rate'] += metrics.tool_success_rate
+        totals['efficiency_score'] += metrics.efficiency_score
+        totals['count'] += 1
         
         logger.info(
             f"Completed {metrics.pattern_type.value} execution for session {session_id} "
@@ -189,18 +237,18 @@ class MetricsTracker:
         """
         comparison = {}
         
-        for pattern_type in PatternType:
-            pattern_metrics = [m for m in self._metrics if m.pattern_type == pattern_type]
+        for pattern_type, totals in self._pattern_totals.items():
+            count = totals['count']
             
-            if pattern_metrics:
+            if count:
                 comparison[pattern_type] = {
-                    'avg_execution_time': sum(m.total_execution_time for m in pattern_metrics) / len(pattern_metrics),
-                    'avg_iterations': sum(m.total_iterations for m in pattern_metrics) / len(pattern_metrics),
-                    'avg_tool_calls': sum(m.tool_calls_count for m in pattern_metrics) / len(pattern_metrics),
-                    'success_rate': sum(1 for m in pattern_metrics if m.success) / len(pattern_metrics),
-                    'avg_tool_success_rate': sum(m.tool_success_rate for m in pattern_metrics) / len(pattern_metrics),
-                    'avg_efficiency_score': sum(m.efficiency_score for m in pattern_metrics) / len(pattern_metrics),
-                    'execution_count': len(pattern_metrics)
+                    'avg_execution_time': totals['execution_time'] / count,
+                    'avg_iterations': totals['iterations'] / count,
+                    'avg_tool_calls': totals['tool_calls'] / count,
+                    'success_rate': totals['successes'] / count,
+                    'avg_tool_success_rate': totals['tool_success_rate'] / count,
+                    'avg_efficiency_score': totals['efficiency_score'] / count,
+                    'execution_count': count
                 }
             else:
                 comparison[pattern_type] = {
@@ -225,10 +273,7 @@ class MetricsTracker:
         Returns:
             ExecutionMetrics object or None if not found
         """
-        for metrics in self._metrics:
-            if metrics.session_id == session_id:
-                return metrics
-        return None
+        return self._by_session.get(session_id)
     
     def get_pattern_metrics(self, pattern_type: PatternType) -> List[ExecutionMetrics]:
         """
@@ -251,20 +296,10 @@ class MetricsTracker:
         """
         comparison = self.get_pattern_comparison()
         
-        report = "# Stage 3 Pattern Comparison Report\n\n"
-        report += "| Pattern | Avg Time (s) | Avg Iterations | Avg Tool Calls | Success Rate | Efficiency Score | Executions |\n"
-        report += "|---------|--------------|----------------|----------------|--------------|------------------|------------|\n"
-        
-        for pattern_type, metrics in comparison.items():
-            report += (
-                f"| {pattern_type.value.upper()} | "
-                f"{metrics['avg_execution_time']:.2f} | "
-                f"{metrics['avg_iterations']:.1f} | "
-                f"{metrics['avg_tool_calls']:.1f} | "
-                f"{metrics['success_rate']:.1%} | "
-                f"{metrics['avg_efficiency_score']:.2f} | "
-                f"{metrics['execution_count']} |\n"
-            )
+        report = _REPORT_HEADER + "".join(
+            _REPORT_ROW.format(name=pattern_type.value.upper(), **metrics)
+            for pattern_type, metrics in comparison.items()
+        )
         
         report += "\n## Key Insights\n"
         
@@ -293,9 +328,17 @@ class MetricsTracker:
         """
         if pattern_type:
             self._metrics = [m for m in self._metrics if m.pattern_type != pattern_type]
+            self._by_session = {}
+            for metrics in self._metrics:
+                self._by_session.setdefault(metrics.session_id, metrics)
+            self._pattern_totals[pattern_type] = self._empty_totals()
             logger.info(f"Cleared metrics for pattern {pattern_type.value}")
         else:
             self._metrics.clear()
+            self._by_session.clear()
+            self._pattern_totals = {
+                pattern_type: self._empty_totals() for pattern_type in PatternType
+            }
             logger.info("Cleared all metrics")
 
 
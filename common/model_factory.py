@@ -3,14 +3,17 @@ Model factory for creating LLM instances across different providers.
 Supports OpenAI, Anthropic, and Ollama with consistent interface.
 """
 
-from typing import Optional, Literal
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_ollama import ChatOllama
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Literal
 
 from common.config import config
 from common.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
+    from langchain_ollama import ChatOllama
+    from langchain_openai import ChatOpenAI
+
 logger = get_logger(__name__)
 
 ModelType = Literal["openai", "anthropic", "ollama"]
@@ -61,6 +64,38 @@ class ModelFactory:
         # Use config default temperature if not explicitly provided
         temperature = temperature if temperature is not None else config.DEFAULT_TEMPERATURE
         
+        try:
+            options = frozenset(kwargs.items())
+        except TypeError:
+            # Unhashable provider options (e.g. dict-valued headers) can't key the cache
+            return ModelFactory._build_model(model_type, model_name, temperature, **kwargs)
+        
+        return _cached_model(model_type, model_name, temperature, options)
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop cached model instances, e.g. after rotating API keys."""
+        _cached_model.cache_clear()
+    
+    @staticmethod
+    def _build_model(
+        model_type: ModelType,
+        model_name: str,
+        temperature: float,
+        **kwargs
+    ):
+        """
+        Construct a new model instance for the given provider.
+        
+        Args:
+            model_type: Type of model ("openai", "anthropic", or "ollama")
+            model_name: Specific model name
+            temperature: Temperature for generation
+            **kwargs: Additional provider-specific parameters
+            
+        Returns:
+            Configured chat model instance
+        """
         logger.info(f"Creating model - type: {model_type}, name: {model_name}, temp: {temperature}")
         
         if model_type == "openai":
@@ -83,7 +118,7 @@ class ModelFactory:
         model_name: str,
         temperature: float,
         **kwargs
-    ) -> ChatOpenAI:
+    ) -> "ChatOpenAI":
         """
         Create OpenAI chat model.
         
@@ -101,6 +136,9 @@ class ModelFactory:
                 "Set it in .env file or use a different model_type."
             )
         
+        # Imported on first use so only the configured provider's SDK is loaded
+        from langchain_openai import ChatOpenAI
+        
         model = ChatOpenAI(
             model=model_name,
             temperature=temperature,
@@ -116,7 +154,7 @@ class ModelFactory:
         model_name: str,
         temperature: float,
         **kwargs
-    ) -> ChatAnthropic:
+    ) -> "ChatAnthropic":
         """
         Create Anthropic chat model.
         
@@ -134,6 +172,8 @@ class ModelFactory:
                 "Set it in .env file or use a different model_type."
             )
         
+        from langchain_anthropic import ChatAnthropic
+        
         model = ChatAnthropic(
             model=model_name,
             temperature=temperature,
@@ -149,7 +189,7 @@ class ModelFactory:
         model_name: str,
         temperature: float,
         **kwargs
-    ) -> ChatOllama:
+    ) -> "ChatOllama":
         """
         Create Ollama chat model (local).
         
@@ -163,6 +203,8 @@ class ModelFactory:
         """
         base_url = kwargs.pop("base_url", config.OLLAMA_BASE_URL)
         
+        from langchain_ollama import ChatOllama
+        
         model = ChatOllama(
             model=model_name,
             base_url=base_url,
@@ -172,3 +214,15 @@ class ModelFactory:
         
         logger.info(f"Ollama model created - model: {model_name}, base_url: {base_url}, temperature: {temperature}")
         return model
+
+
+@lru_cache(maxsize=32)
+def _cached_model(model_type: ModelType, model_name: str, temperature: float, options: frozenset):
+    """
+    Build a model once per distinct configuration and share it between callers.
+    
+    Chat model instances are only read after construction (callers use
+    bind_tools/invoke, which don't mutate them), so agents created with the
+    same settings can reuse one client and its connection pool.
+    """
+    return ModelFactory._build_model(model_type, model_name, temperature, **dict(options))
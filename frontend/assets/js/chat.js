@@ -420,13 +420,16 @@ export async function sendMessage(message) {
         let agentResponseDiv = null;
         let agentResponse = '';
         let struggleSummaryAdded = false;
+        // Events arrive unthrottled, so a read can end mid-line; carry the remainder over
+        let pending = '';
 
         while (true) {
             const { done, value } = await reader.read();
             if (done) break;
 
-            const chunk = decoder.decode(value);
-            const lines = chunk.split('\n');
+            pending += decoder.decode(value, { stream: true });
+            const lines = pending.split('\n');
+            pending = lines.pop();
 
             for (const line of lines) {
                 if (line.startsWith('data: ')) {
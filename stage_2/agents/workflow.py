@@ -173,6 +173,9 @@ class AgentWorkflow(BaseWorkflow):
         try:
             result = self.workflow.invoke(initial_state, config) if config else self.workflow.invoke(initial_state)
             
+            # Index of this turn's first message, so callers can skip conversation history
+            result["new_message_offset"] = len(initial_state["messages"]) - 1
+            
             # Add struggle statistics to result
             result["struggle_stats"] = self.get_struggle_stats()
             
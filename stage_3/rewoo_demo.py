@@ -124,7 +124,7 @@ get a refund and buy locally. Also, do you have the same item in blue instead of
     try:
         # Use streaming to show step-by-step execution
         for step in workflow.stream(message):
-            node_name = list(step.keys())[0]
+            node_name = next(iter(step))
             print(f"\n🔄 Step: {node_name}")
             
             if node_name == "plan":
@@ -137,7 +137,7 @@ get a refund and buy locally. Also, do you have the same item in blue instead of
                 # Show tool execution
                 results = step[node_name].get("results", {})
                 if results:
-                    latest_key = list(results.keys())[-1]
+                    latest_key = next(reversed(results))
                     print(f"   Executed: {latest_key}")
                     print(f"   Result preview: {results[latest_key][:100]}...")
             
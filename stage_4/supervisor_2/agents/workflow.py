@@ -143,6 +143,9 @@ class CustomSupervisorWorkflow(BaseWorkflow):
         try:
             result = self.workflow.invoke(initial_state, config) if config else self.workflow.invoke(initial_state)
             
+            # Index of this turn's first message, so callers can skip conversation history
+            result["new_message_offset"] = len(initial_state["messages"]) - 1
+            
             logger.info(f"Stage 4 Custom Supervisor complete - messages: {len(result.get('messages', []))}")
             
             return result